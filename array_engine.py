@@ -0,0 +1,221 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # numpy 是可选依赖，只有数组引擎需要
+    np = None
+
+from game_core import NEUTRAL, PLAYER, ENEMY, fleet_speed
+
+# 数组化（SoA）的星球/舰队状态，适合上万支舰队同时在途的大规模对战
+# 结算规则与 game_core 中 Fleet.arrive / Planet.produce_ships 一致
+
+N_OWNERS = 3
+
+
+class ArrayState:
+    def __init__(self, x, y, owner, ships, production_rate, fleet_capacity=1024):
+        if np is None:
+            raise ImportError("ArrayState 需要 numpy：pip install numpy")
+
+        # 星球
+        self.planet_x = np.asarray(x, dtype=np.float64)
+        self.planet_y = np.asarray(y, dtype=np.float64)
+        self.planet_owner = np.asarray(owner, dtype=np.int8)
+        self.planet_ships = np.asarray(ships, dtype=np.int64)
+        self.planet_production = np.asarray(production_rate, dtype=np.int64)
+
+        # 舰队（按发射顺序存放，前 fleet_count 项有效）
+        self.fleet_count = 0
+        self.fleet_start = np.empty(fleet_capacity, dtype=np.int32)
+        self.fleet_end = np.empty(fleet_capacity, dtype=np.int32)
+        self.fleet_progress = np.empty(fleet_capacity, dtype=np.float64)
+        self.fleet_speed = np.empty(fleet_capacity, dtype=np.float64)
+        self.fleet_ships = np.empty(fleet_capacity, dtype=np.int64)
+        self.fleet_owner = np.empty(fleet_capacity, dtype=np.int8)
+
+    @classmethod
+    def from_game(cls, game):
+        planets = game.planets
+        state = cls(
+            [p.x for p in planets],
+            [p.y for p in planets],
+            [p.owner for p in planets],
+            [p.ships for p in planets],
+            [p.production_rate for p in planets],
+            fleet_capacity=max(1024, len(game.arrivals)),
+        )
+        # 每一波是一支数组舰队，按发射顺序存放（同一帧到达时的结算顺序）
+        for _, _, fleet, wave in sorted(game.arrivals, key=lambda entry: entry[1]):
+            i = state._append(fleet.start_planet.index, fleet.end_planet.index, wave[2], fleet.owner)
+            state.fleet_progress[i] = fleet.wave_progress(wave, game.turn_count)
+        return state
+
+    # 把数组状态写回对象模型（用于绘制或与原逻辑对照）
+    def write_back(self, game):
+        for i, planet in enumerate(game.planets):
+            planet.owner = int(self.planet_owner[i])
+            planet.ships = int(self.planet_ships[i])
+            planet.color = planet.get_color()
+
+        # 由剩余进度反推发射帧和到达帧，同一航线上的舰队作为一组里的各波重新放进到达队列
+        game.clear_fleets()
+        groups = {}
+        for i in range(self.fleet_count):
+            start = game.planets[self.fleet_start[i]]
+            end = game.planets[self.fleet_end[i]]
+            ships = int(self.fleet_ships[i])
+            owner = int(self.fleet_owner[i])
+            progress = float(self.fleet_progress[i])
+            speed = float(self.fleet_speed[i])
+            launch_tick = game.turn_count - progress / speed
+            arrival_tick = game.turn_count + math.ceil((1 - progress) / speed)
+            fleet = groups.get((start, end, owner))
+            if fleet is None:
+                fleet = game.fleet_class(start, end, ships, owner, launch_tick, arrival_tick)
+                groups[fleet.route()] = fleet
+                game.add_fleet(fleet)
+            else:
+                game.schedule(fleet, fleet.add_wave(ships, launch_tick, arrival_tick))
+        game.recount()
+
+    def _grow(self, needed):
+        capacity = len(self.fleet_start)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("fleet_start", "fleet_end", "fleet_progress", "fleet_speed", "fleet_ships", "fleet_owner"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.fleet_count] = old[:self.fleet_count]
+            setattr(self, name, new)
+
+    def _append(self, source, target, ships, owner):
+        self._grow(self.fleet_count + 1)
+        i = self.fleet_count
+        self.fleet_start[i] = source
+        self.fleet_end[i] = target
+        self.fleet_progress[i] = 0.0
+        self.fleet_speed[i] = fleet_speed(ships)
+        self.fleet_ships[i] = ships
+        self.fleet_owner[i] = owner
+        self.fleet_count += 1
+        return i
+
+    def launch(self, source, target, ships, owner):
+        self.planet_ships[source] -= ships
+        return self._append(source, target, ships, owner)
+
+    # 一次发射多支舰队（同一星球可出现多次，按顺序扣除）
+    def launch_many(self, sources, targets, ships, owners):
+        sources = np.asarray(sources, dtype=np.int32)
+        ships = np.asarray(ships, dtype=np.int64)
+        count = len(sources)
+        self._grow(self.fleet_count + count)
+        np.subtract.at(self.planet_ships, sources, ships)
+
+        s = slice(self.fleet_count, self.fleet_count + count)
+        self.fleet_start[s] = sources
+        self.fleet_end[s] = targets
+        self.fleet_progress[s] = 0.0
+        # 与对象模型用同一个速度函数，保证到达帧一致
+        self.fleet_speed[s] = [fleet_speed(int(count)) for count in ships]
+        self.fleet_ships[s] = ships
+        self.fleet_owner[s] = owners
+        self.fleet_count += count
+
+    def produce_ships(self):
+        self.planet_ships += np.where(self.planet_owner != NEUTRAL, self.planet_production, 0)
+
+    def fleet_positions(self):
+        n = self.fleet_count
+        start = self.fleet_start[:n]
+        end = self.fleet_end[:n]
+        progress = self.fleet_progress[:n]
+        xs = self.planet_x[start] + (self.planet_x[end] - self.planet_x[start]) * progress
+        ys = self.planet_y[start] + (self.planet_y[end] - self.planet_y[start]) * progress
+        return xs, ys
+
+    # 推进一帧：移动、到达检测、结算，返回本帧到达的舰队数
+    def update(self):
+        n = self.fleet_count
+        progress = self.fleet_progress[:n]
+        progress += self.fleet_speed[:n]
+        arrived = progress >= 1
+        arrived_idx = np.flatnonzero(arrived)
+        if len(arrived_idx) == 0:
+            return 0
+
+        self._resolve_arrivals(arrived_idx)
+
+        keep = ~arrived
+        remaining = n - len(arrived_idx)
+        for name in ("fleet_start", "fleet_end", "fleet_progress", "fleet_speed", "fleet_ships", "fleet_owner"):
+            arr = getattr(self, name)
+            arr[:remaining] = arr[:n][keep]
+        self.fleet_count = remaining
+        return len(arrived_idx)
+
+    def _resolve_arrivals(self, idx):
+        ends = self.fleet_end[idx].astype(np.int64)
+        owners = self.fleet_owner[idx].astype(np.int64)
+        ships = self.fleet_ships[idx]
+        num_planets = len(self.planet_owner)
+
+        # 按 (目标星球, 归属) 分组求和
+        key = ends * N_OWNERS + owners
+        totals = np.bincount(key, weights=ships, minlength=num_planets * N_OWNERS)
+        totals = totals.astype(np.int64).reshape(num_planets, N_OWNERS)
+        present = np.bincount(key, minlength=num_planets * N_OWNERS).reshape(num_planets, N_OWNERS) > 0
+        owners_arriving = present.sum(axis=1)
+
+        planet_owner = self.planet_owner
+        planet_ships = self.planet_ships
+        sequential = np.zeros(num_planets, dtype=bool)
+
+        # 只有一方到达：合并后结算与逐个结算结果相同
+        single = np.flatnonzero(owners_arriving == 1)
+        if len(single):
+            arriving = present[single].argmax(axis=1).astype(np.int8)
+            incoming = totals[single, arriving]
+            current = planet_ships[single]
+            same = planet_owner[single] == arriving
+            capture = ~same & (incoming > current)
+            planet_ships[single] = np.where(same, current + incoming,
+                                            np.where(capture, incoming - current, current - incoming))
+            planet_owner[single] = np.where(capture, arriving, planet_owner[single])
+
+        # 双方同时到达已被占领的星球：带符号求和，结果为0时归属取决于顺序，交给逐个结算
+        multi = np.flatnonzero(owners_arriving > 1)
+        if len(multi):
+            held = planet_owner[multi] != NEUTRAL
+            contested = multi[held]
+            sign = np.where(planet_owner[contested] == PLAYER, 1, -1)
+            value = sign * planet_ships[contested] + totals[contested, PLAYER] - totals[contested, ENEMY]
+            resolved = value != 0
+            done = contested[resolved]
+            planet_owner[done] = np.where(value[resolved] > 0, PLAYER, ENEMY)
+            planet_ships[done] = np.abs(value[resolved])
+            sequential[contested[~resolved]] = True
+            # 中立星球被多方同时进攻：结果依赖到达顺序
+            sequential[multi[~held]] = True
+
+        if sequential.any():
+            for i in idx[sequential[ends]]:
+                target = self.fleet_end[i]
+                owner = self.fleet_owner[i]
+                count = self.fleet_ships[i]
+                if planet_owner[target] == owner:
+                    planet_ships[target] += count
+                elif count > planet_ships[target]:
+                    planet_owner[target] = owner
+                    planet_ships[target] = count - planet_ships[target]
+                else:
+                    planet_ships[target] -= count
+
+    def planet_counts(self):
+        return np.bincount(self.planet_owner, minlength=N_OWNERS)
+
+    def fleet_counts(self):
+        return np.bincount(self.fleet_owner[:self.fleet_count], minlength=N_OWNERS)
@@ -0,0 +1,80 @@
+import argparse
+import statistics
+import time
+from multiprocessing import Pool
+
+from game_core import Game, PLAYER, ENEMY
+from search_ai import SearchAI
+
+# 无窗口批量对战：双方都由AI控制，用于离线调参
+DEFAULT_MAX_TICKS = 60 * 60 * 10  # 按60帧/秒计算，最多10分钟
+
+
+def play_match(args):
+    seed, max_ticks, num_planets, search_budget = args
+    game = Game(seed=seed, ai_players=(PLAYER, ENEMY), num_planets=num_planets)
+    if search_budget:
+        # 敌方使用搜索AI（同步模式：批量对战本身已经在多进程里跑；预算换算成固定推演次数，结果只取决于种子）
+        game.ai_controllers[ENEMY] = SearchAI(budget=search_budget, mode="inline")
+    while not game.game_over and game.turn_count < max_ticks:
+        game.tick()
+    return seed, game.winner, game.turn_count
+
+
+def run_batch(matches, workers=None, seed=0, max_ticks=DEFAULT_MAX_TICKS, num_planets=10, chunksize=16,
+              search_budget=None):
+    jobs = [(seed + i, max_ticks, num_planets, search_budget) for i in range(matches)]
+    start = time.perf_counter()
+    with Pool(workers) as pool:
+        results = list(pool.imap_unordered(play_match, jobs, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    results.sort()
+    return results, elapsed
+
+
+def summarize(results, elapsed):
+    wins = {PLAYER: 0, ENEMY: 0, None: 0}
+    for _, winner, _ in results:
+        wins[winner] += 1
+    lengths = [ticks for _, _, ticks in results]
+    total_ticks = sum(lengths)
+    return {
+        "matches": len(results),
+        "player_wins": wins[PLAYER],
+        "enemy_wins": wins[ENEMY],
+        "timeouts": wins[None],
+        "mean_ticks": statistics.mean(lengths) if lengths else 0,
+        "median_ticks": statistics.median(lengths) if lengths else 0,
+        "min_ticks": min(lengths, default=0),
+        "max_ticks": max(lengths, default=0),
+        "elapsed": elapsed,
+        "matches_per_sec": len(results) / elapsed if elapsed > 0 else 0,
+        "ticks_per_sec": total_ticks / elapsed if elapsed > 0 else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量运行无窗口的AI对战")
+    parser.add_argument("--matches", type=int, default=1000, help="对战局数")
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认CPU核数）")
+    parser.add_argument("--seed", type=int, default=0, help="起始随机种子，第i局使用 seed+i")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS, help="单局最多逻辑帧数，超出记为超时")
+    parser.add_argument("--planets", type=int, default=10, help="星球数量")
+    parser.add_argument("--search-ai", type=float, metavar="SECONDS",
+                        help="敌方改用搜索AI，参数为每次决策的预算（秒，按固定的推演次数换算，与机器快慢无关）")
+    args = parser.parse_args()
+
+    results, elapsed = run_batch(args.matches, args.workers, args.seed, args.max_ticks, args.planets,
+                                 chunksize=1 if args.search_ai else 16, search_budget=args.search_ai)
+    summary = summarize(results, elapsed)
+
+    print(f"对战局数: {summary['matches']}")
+    print(f"玩家胜: {summary['player_wins']} | 敌人胜: {summary['enemy_wins']} | 超时: {summary['timeouts']}")
+    print(f"对局长度(帧): 平均 {summary['mean_ticks']:.0f} | 中位数 {summary['median_ticks']:.0f} | "
+          f"最短 {summary['min_ticks']} | 最长 {summary['max_ticks']}")
+    print(f"耗时: {summary['elapsed']:.2f}s | {summary['matches_per_sec']:.1f} 局/秒 | "
+          f"{summary['ticks_per_sec']:.0f} 帧/秒")
+
+
+if __name__ == "__main__":
+    main()
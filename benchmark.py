@@ -0,0 +1,224 @@
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+import game_core as core
+from game_core import Game, PLAYER, ENEMY
+from profiler import FrameProfiler
+
+# 可复现的基准测试：固定种子的场景，分别测纯逻辑、离屏渲染和数组引擎（array_engine.ArrayState）
+# 每个场景的地图大小按星球数放大，保证星球都能放下
+
+PLANET_COUNTS = (10, 100, 1000)
+TRAFFIC = ("idle", "heavy")
+DEFAULT_TICKS = 600
+
+
+def map_size(num_planets):
+    # 每个星球大约占 (1.6 * 最小间距)² 的面积，保持 10:7 的比例
+    area = num_planets * (core.MIN_PLANET_DISTANCE * 1.6) ** 2
+    width = max(core.WIDTH, int(math.sqrt(area * 10 / 7)))
+    height = max(core.HEIGHT, int(width * 7 / 10))
+    return width, height
+
+
+def build_scenario(game_class, num_planets, traffic, seed):
+    width, height = map_size(num_planets)
+    game = game_class(seed=seed, ai_players=(), num_planets=num_planets, width=width, height=height)
+    if traffic == "heavy":
+        # 所有星球分给双方，兵力充足，保证整个测试期间都有大量舰队在途
+        rng = random.Random(seed)
+        for planet in game.planets:
+            planet.owner = rng.choice((PLAYER, ENEMY))
+            planet.color = planet.get_color()
+            planet.ships = 10 ** 6
+        game.recount()
+    return game
+
+
+# 大量舰队场景每帧的发射次数：航程 70~90 帧，1000 个星球时稳定在一万多支在途舰队
+def launch_rate(num_planets, traffic):
+    return max(5, num_planets // 8) if traffic == "heavy" else 0
+
+
+def heavy_launches(game, rng, count):
+    planets = game.planets
+    for _ in range(count):
+        source = rng.choice(planets)
+        target = rng.choice(planets)
+        if source is not target and source.ships > 1:
+            game.launch_fleet(source, target, rng.randint(1, 50), source.owner)
+
+
+# 与 heavy_launches 相同的随机序列，但一次性交给 ArrayState.launch_many
+def heavy_launches_array(state, rng, count):
+    n = len(state.planet_owner)
+    sources, targets, ships = [], [], []
+    for _ in range(count):
+        source = rng.randrange(n)
+        target = rng.randrange(n)
+        if source != target and state.planet_ships[source] > 1:
+            sources.append(source)
+            targets.append(target)
+            ships.append(rng.randint(1, 50))
+    if sources:
+        state.launch_many(sources, targets, ships, state.planet_owner[sources])
+
+
+def run_array_scenario(num_planets, traffic, ticks, seed):
+    from array_engine import ArrayState
+
+    state = ArrayState.from_game(build_scenario(Game, num_planets, traffic, seed))
+    rng = random.Random(seed + 1)
+    launches = launch_rate(num_planets, traffic)
+
+    profiler = FrameProfiler(history=ticks)
+    production_timer = 0
+    for _ in range(ticks):
+        profiler.begin_frame()
+        with profiler.phase("sim"):
+            if launches:
+                heavy_launches_array(state, rng, launches)
+            production_timer += 1
+            if production_timer >= core.PRODUCTION_INTERVAL:
+                state.produce_ships()
+                production_timer = 0
+            state.update()
+        profiler.end_frame()
+    return scenario_result(f"array-{num_planets}-{traffic}", profiler, ticks,
+                           len(state.planet_owner), state.fleet_count)
+
+
+def run_scenario(num_planets, traffic, ticks, seed, render=False):
+    if render:
+        import pygame
+        import game_Auto
+        from render_cache import TextCache, SpriteCache, StaticLayer
+        if game_Auto.screen is None:
+            game_Auto.init_display()
+        game_class = game_Auto.Game
+    else:
+        game_class = Game
+
+    game = build_scenario(game_class, num_planets, traffic, seed)
+    rng = random.Random(seed + 1)
+    launches = launch_rate(num_planets, traffic)
+
+    surface = None
+    warmup = 0.0
+    profiler = FrameProfiler(history=ticks)
+    if render:
+        # 每个场景用全新的缓存，并先画一帧不计时（静态层重建、精灵烘焙），
+        # 结果不受之前跑过哪些场景影响；这一帧的耗时单独报告
+        game_Auto.text_cache = TextCache()
+        game_Auto.sprites = SpriteCache()
+        game_Auto.static_layer = StaticLayer(game_Auto.LINE_COLOR, game_Auto.BLACK)
+        surface = pygame.Surface((game.width, game.height))
+        start = time.perf_counter()
+        game.draw(surface)
+        warmup = time.perf_counter() - start
+        game_Auto.profiler = profiler
+
+    for _ in range(ticks):
+        profiler.begin_frame()
+        with profiler.phase("sim"):
+            if launches:
+                heavy_launches(game, rng, launches)
+            game.tick()
+        if render:
+            with profiler.phase("draw"):
+                game.draw(surface)
+        profiler.end_frame()
+
+    if render:
+        game_Auto.profiler = FrameProfiler(enabled=False)
+
+    result = scenario_result(f"{'render' if render else 'sim'}-{num_planets}-{traffic}", profiler, ticks,
+                             len(game.planets), len(game.arrivals))
+    if render:
+        result["warmup_ms"] = warmup * 1000
+    return result
+
+
+def scenario_result(name, profiler, ticks, planets, fleets):
+    summary = profiler.summary()
+    total = sum(frame["total"] for frame in profiler.frames)
+    return {
+        "name": name,
+        "planets": planets,
+        "fleets_in_flight": fleets,  # 按发射（波）计数，合并成组的也分开算
+        "ticks": ticks,
+        "ticks_per_sec": ticks / total if total > 0 else 0.0,
+        "p50_ms": summary["total"]["p50"] * 1000,
+        "p99_ms": summary["total"]["p99"] * 1000,
+        "phases_p50_ms": {name: stats["p50"] * 1000 for name, stats in summary.items()
+                          if name not in ("total", "net_blocks", "gc0")},
+        "net_blocks_p50": summary["net_blocks"]["p50"],
+    }
+
+
+# 与基线比较：p50 比基线慢超过 tolerance 即视为回归
+def compare(results, baseline, tolerance):
+    previous = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get(result["name"])
+        if old and result["p50_ms"] > old["p50_ms"] * (1 + tolerance):
+            regressions.append((result["name"], old["p50_ms"], result["p50_ms"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="行星战争基准测试")
+    parser.add_argument("--mode", choices=("sim", "render", "array", "both"), default="sim",
+                        help="sim: 只跑逻辑; render: 逻辑 + 离屏渲染; array: 数组引擎（需要 numpy）")
+    parser.add_argument("--planets", type=int, nargs="+", default=list(PLANET_COUNTS))
+    parser.add_argument("--traffic", choices=TRAFFIC, nargs="+", default=list(TRAFFIC))
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="PATH", help="把结果保存为 JSON（可作为以后的基线）")
+    parser.add_argument("--baseline", metavar="PATH", help="与之前保存的结果比较")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许比基线慢的比例")
+    args = parser.parse_args()
+
+    if args.mode in ("render", "both"):
+        # 离屏渲染不需要真实窗口
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    modes = {"sim": ("sim",), "render": ("render",), "array": ("array",), "both": ("sim", "render")}[args.mode]
+    results = []
+    for mode in modes:
+        for num_planets in args.planets:
+            for traffic in args.traffic:
+                start = time.perf_counter()
+                if mode == "array":
+                    result = run_array_scenario(num_planets, traffic, args.ticks, args.seed)
+                else:
+                    result = run_scenario(num_planets, traffic, args.ticks, args.seed, mode == "render")
+                result["wall_sec"] = time.perf_counter() - start
+                results.append(result)
+                print(f"{result['name']:<22} 星球 {result['planets']:>5}  在途舰队 {result['fleets_in_flight']:>6}  "
+                      f"p50 {result['p50_ms']:8.3f}ms  p99 {result['p99_ms']:8.3f}ms  "
+                      f"{result['ticks_per_sec']:10.0f} 帧/秒"
+                      + (f"  预热 {result['warmup_ms']:.1f}ms" if "warmup_ms" in result else ""))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"seed": args.seed, "ticks": args.ticks, "results": results}, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, old, new in regressions:
+            print(f"回归: {name} p50 {old:.3f}ms -> {new:.3f}ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import pygame
+
+# 脏矩形渲染：只重画并提交本帧变化的区域
+# 需要 game 提供 draw / draw_hud / hud_bounds / fleet_sprites，星球和舰队精灵提供 draw / bounds
+
+
+class DirtyRenderer:
+    def __init__(self, static_layer, background_image):
+        self.static_layer = static_layer
+        self.background_image = background_image
+        self.game = None
+        self.planet_states = {}
+        self.fleet_rects = []
+        self.hud_rect = None
+        self.overlay_state = None
+        self.extra_dirty = []
+        self.full_redraws = 0
+
+    def invalidate(self):
+        self.game = None
+
+    # 标记一块被外部覆盖过的区域（例如性能面板），下一帧一起重画
+    def mark_dirty(self, rect):
+        self.extra_dirty.append(pygame.Rect(rect))
+
+    # 绘制一帧，返回需要提交的矩形列表；返回 None 表示整屏重画
+    def render(self, game, surface):
+        map_changed = self.static_layer.ensure(surface, game.planets, self.background_image)
+
+        if game.game_over:
+            # 结束画面有整屏遮罩，状态变化时整屏重画，否则不提交任何区域
+            overlay_state = (id(game), game.winner, tuple((p.owner, p.ships) for p in game.planets))
+            if overlay_state == self.overlay_state and not map_changed and not self.extra_dirty:
+                return []
+            self.overlay_state = overlay_state
+            return self.full_redraw(game, surface)
+
+        if game is not self.game or map_changed or self.overlay_state is not None:
+            self.overlay_state = None
+            return self.full_redraw(game, surface)
+
+        dirty = self.extra_dirty
+        self.extra_dirty = []
+
+        # 数量、归属或选中状态变化的星球
+        planet_rects = []
+        for planet in game.planets:
+            state = (planet.owner, planet.ships, planet.selected)
+            rect = planet.bounds()
+            planet_rects.append(rect)
+            old = self.planet_states.get(id(planet))
+            if old is None or old[0] != state:
+                if old is not None:
+                    dirty.append(old[1])
+                dirty.append(rect)
+                self.planet_states[id(planet)] = (state, rect)
+
+        # 舰队每帧都在移动：旧位置和新位置都要重画
+        fleets = game.fleet_sprites()
+        fleet_rects = [fleet.bounds() for fleet in fleets]
+        dirty.extend(self.fleet_rects)
+        dirty.extend(fleet_rects)
+        self.fleet_rects = fleet_rects
+
+        # 状态栏
+        hud_rect = game.hud_bounds()
+        hud_text = game.status_text()
+        if hud_text != self.hud_rect[0]:
+            dirty.append(self.hud_rect[1])
+            dirty.append(hud_rect)
+            self.hud_rect = (hud_text, hud_rect)
+
+        if not dirty:
+            return []
+
+        dirty = merge_rects(dirty)
+        for rect in dirty:
+            surface.set_clip(rect)
+            self.static_layer.restore(surface, rect)
+            for i in rect.collidelistall(planet_rects):
+                game.planets[i].draw(surface)
+            for i in rect.collidelistall(fleet_rects):
+                fleets[i].draw(surface)
+            if rect.colliderect(hud_rect):
+                game.draw_hud(surface)
+        surface.set_clip(None)
+        return dirty
+
+    def full_redraw(self, game, surface):
+        self.extra_dirty = []
+        game.draw(surface)
+        self.game = game
+        self.planet_states = {id(p): ((p.owner, p.ships, p.selected), p.bounds()) for p in game.planets}
+        self.fleet_rects = [fleet.bounds() for fleet in game.fleet_sprites()]
+        self.hud_rect = (game.status_text(), game.hud_bounds())
+        self.full_redraws += 1
+        return None
+
+    # 把矩形提交到屏幕：None 表示整屏 flip
+    @staticmethod
+    def present(rects):
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+
+# 合并相互重叠的矩形，减少重复重画的面积和次数
+def merge_rects(rects):
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
@@ -1,322 +1,400 @@
+import time
+
+# 启动计时：从导入本模块开始到画出第一帧
+STARTUP_START = time.perf_counter()
+
 import pygame
-import random
-import math
+import argparse
+import os
 import sys
 
-# 初始化pygame
-pygame.init()
-
-# 屏幕设置
-WIDTH, HEIGHT = 1000, 700
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("行星战争")
+import game_core as core
+from game_core import WIDTH, HEIGHT, PLAYER_COLOR, ENEMY_COLOR
+from render_cache import TextCache, SpriteCache, StaticLayer
+from dirty_renderer import DirtyRenderer
+from timestep import FixedTimestep, SIM_RATE
+from profiler import FrameProfiler
+from replay import Replay, ReplayPlayer, ReplayRecorder
+from startup_cache import load_font, load_background
 
 # 颜色定义
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
-PLAYER_COLOR = (78, 192, 255)  # 玩家颜色
-ENEMY_COLOR = (255, 96, 96)   # 敌人颜色
-NEUTRAL_COLOR = (180, 180, 180) # 中立颜色
 LINE_COLOR = (50, 50, 50)     # 连线颜色
 
-# 字体
-font = pygame.font.SysFont('SimHei', 20)
-large_font = pygame.font.SysFont('SimHei', 32)
+BACKGROUND_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_background.jpg")
+
+# 屏幕、字体和背景在 init_display() 中初始化，导入本模块不会打开窗口
+screen = None
+font = None
+large_font = None
+background_image = None
+
+# 只初始化用到的显示和字体模块（不初始化音频等），字体路径和缩放后的背景图走磁盘缓存
+# 返回各步骤耗时（秒）
+def init_display(size=(WIDTH, HEIGHT)):
+    global screen, font, large_font, background_image
+    timings = {}
+
+    start = time.perf_counter()
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption("行星战争")
+    timings["display"] = time.perf_counter() - start
 
-# 加载背景图片
-try:
-    background_image = pygame.image.load("space_background.jpg").convert()
-    background_image = pygame.transform.scale(background_image, (WIDTH, HEIGHT))
-except pygame.error:
-    print("Warning: space_background.jpg not found. Using a solid black background.")
-    background_image = None
+    start = time.perf_counter()
+    font = load_font('SimHei', 20)
+    large_font = load_font('SimHei', 32)
+    timings["fonts"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    background_image = load_background(BACKGROUND_PATH, size)
+    if background_image is None:
+        print("Warning: space_background.jpg not found. Using a solid black background.")
+    timings["background"] = time.perf_counter() - start
+    return timings
+
+# 渲染缓存
+text_cache = TextCache()
+sprites = SpriteCache()
+static_layer = StaticLayer(LINE_COLOR, BLACK)
+
+# 性能统计（默认关闭，F3 或 --profile 打开）
+profiler = FrameProfiler(enabled=False)
 
 # 星球类
-class Planet:
-    def __init__(self, x, y, radius, owner, ships, production_rate):
-        self.x = x
-        self.y = y
-        self.radius = radius
-        self.owner = owner  # 0: 中立, 1: 玩家, 2: 敌人
-        self.ships = ships
-        self.production_rate = production_rate
-        self.selected = False
-        self.color = self.get_color()
-        self.glow_radius = radius + 5
-        self.glow_color = self.color
-
-    def get_color(self):
-        if self.owner == 0:
-            return NEUTRAL_COLOR
-        elif self.owner == 1:
-            return PLAYER_COLOR
-        else:
-            return ENEMY_COLOR
-            
-    def produce_ships(self):
-        if self.owner != 0:
-            self.ships += self.production_rate
-            
+class Planet(core.Planet):
     def draw(self, surface):
         # 绘制星球本体
         pygame.draw.circle(surface, self.color, (self.x, self.y), self.radius)
         
         # 绘制星球光晕（根据归属和选中状态）
         if self.owner != 0:
-            glow_surface = pygame.Surface((self.glow_radius * 2, self.glow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (self.color[0], self.color[1], self.color[2], 50), (self.glow_radius, self.glow_radius), self.glow_radius)
-            surface.blit(glow_surface, (self.x - self.glow_radius, self.y - self.glow_radius))
+            glow_sprite = sprites.glow(self.glow_radius, self.color)
+            surface.blit(glow_sprite, (self.x - self.glow_radius, self.y - self.glow_radius))
 
         # 绘制星球环
-        pygame.draw.circle(surface, (255, 255, 255, 50), (self.x, self.y), self.radius + 5, 2)
+        ring_sprite = sprites.ring(self.radius + 5, WHITE)
+        surface.blit(ring_sprite, (self.x - self.radius - 5, self.y - self.radius - 5))
         
         # 如果被选中，绘制选择圆圈
         if self.selected:
-            pygame.draw.circle(surface, WHITE, (self.x, self.y), self.radius + 7, 2)
+            select_sprite = sprites.ring(self.radius + 7, WHITE)
+            surface.blit(select_sprite, (self.x - self.radius - 7, self.y - self.radius - 7))
             
         # 绘制飞船数量
-        text = font.render(str(self.ships), True, WHITE)
+        text = text_cache.render(font, str(self.ships), WHITE)
         text_rect = text.get_rect(center=(self.x, self.y))
         surface.blit(text, text_rect)
-        
-    def is_clicked(self, pos):
-        distance = math.sqrt((pos[0] - self.x) ** 2 + (pos[1] - self.y) ** 2)
-        return distance <= self.radius
-
-# 舰队类
-class Fleet:
-    def __init__(self, start_planet, end_planet, ships, owner):
-        self.start_planet = start_planet
-        self.end_planet = end_planet
-        self.ships = ships
-        self.owner = owner
-        self.color = PLAYER_COLOR if owner == 1 else ENEMY_COLOR
-        self.x = start_planet.x
-        self.y = start_planet.y
-        self.progress = 0
-        
-        BASE_SPEED = 0.015
-        SPEED_FACTOR = 1000
-        
-        speed_modifier = math.log(self.ships + 1) / SPEED_FACTOR
-        self.speed = max(BASE_SPEED - speed_modifier, 0.001)
-        
-    def update(self):
-        self.progress += self.speed
-        if self.progress >= 1:
-            self.arrive()
-            return True
-            
-        self.x = self.start_planet.x + (self.end_planet.x - self.start_planet.x) * self.progress
-        self.y = self.start_planet.y + (self.end_planet.y - self.start_planet.y) * self.progress
-        return False
-        
-    def arrive(self):
-        if self.end_planet.owner == self.owner:
-            self.end_planet.ships += self.ships
-        else:
-            if self.ships > self.end_planet.ships:
-                self.end_planet.owner = self.owner
-                self.end_planet.ships = self.ships - self.end_planet.ships
-                self.end_planet.color = self.end_planet.get_color()
-            else:
-                self.end_planet.ships -= self.ships
-                
+
+    # 星球占用的屏幕区域（光晕、选择圈和数字）
+    def bounds(self):
+        r = self.radius + 8
+        rect = pygame.Rect(self.x - r, self.y - r, r * 2, r * 2)
+        text = text_cache.render(font, str(self.ships), WHITE)
+        return rect.union(text.get_rect(center=(self.x, self.y)))
+
+# 舰队类（一组舰队：多波时从最后一波到领头一波画一条线段，数字是总数）
+class Fleet(core.Fleet):
     def draw(self, surface):
-        pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), 5)
+        head = (int(self.x), int(self.y))
+        if len(self.waves) > 1:
+            pygame.draw.line(surface, self.color, (int(self.tail_x), int(self.tail_y)), head, 3)
+        pygame.draw.circle(surface, self.color, head, 5)
         
-        text = font.render(str(self.ships), True, WHITE)
-        surface.blit(text, (int(self.x) + 10, int(self.y) - 10))
+        text = text_cache.render(font, str(self.ships), WHITE)
+        surface.blit(text, (head[0] + 10, head[1] - 10))
 
-# 游戏类
-class Game:
-    def __init__(self):
-        self.planets = []
-        self.fleets = []
-        self.selected_planet = None
-        self.game_over = False
-        self.winner = None
-        self.turn_count = 0
-        self.setup_game()
-        
-    def setup_game(self):
-        self.planets = []
-        num_planets = 10
-        for i in range(num_planets):
-            while True:
-                x = random.randint(50, WIDTH - 50)
-                y = random.randint(50, HEIGHT - 50)
-                too_close = False
-                for planet in self.planets:
-                    distance = math.sqrt((x - planet.x) ** 2 + (y - planet.y) ** 2)
-                    if distance < 100:
-                        too_close = True
-                        break
-                if not too_close:
-                    break
-                    
-            radius = random.randint(20, 40)
-            owner = 0
-            if i == 0:
-                owner = 1
-            elif i == 1:
-                owner = 2
-                
-            ships = random.randint(10, 50) if owner != 0 else random.randint(5, 20)
-            production_rate = random.randint(1, 5)
-            self.planets.append(Planet(x, y, radius, owner, ships, production_rate))
-            
-    def select_planet(self, pos):
-        for planet in self.planets:
-            if planet.is_clicked(pos):
-                return planet
-        return None
-        
-    def update(self):
-        for fleet in self.fleets[:]:
-            if fleet.update():
-                self.fleets.remove(fleet)
-                
-        player_planets = sum(1 for p in self.planets if p.owner == 1)
-        enemy_planets = sum(1 for p in self.planets if p.owner == 2)
+    def bounds(self):
+        x, y = int(self.x), int(self.y)
+        rect = pygame.Rect(x - 6, y - 6, 13, 13)
+        if len(self.waves) > 1:
+            tail = (int(self.tail_x), int(self.tail_y))
+            rect.union_ip(pygame.Rect(tail, (0, 0)).inflate(6, 6))
+        text = text_cache.render(font, str(self.ships), WHITE)
+        return rect.union(text.get_rect(topleft=(x + 10, y - 10)))
+
+# 游戏类（逻辑见 game_core.Game，这里只负责绘制）
+class Game(core.Game):
+    planet_class = Planet
+    fleet_class = Fleet
+    render_alpha = 0.0  # 渲染时舰队位置在两个逻辑帧之间的插值比例
+
+    def ai_turn(self, owner=core.ENEMY):
+        with profiler.phase("ai"):
+            super().ai_turn(owner)
+
+    def draw(self, surface):
+        # 背景和连线只在地图变化时重新合成（"rebuild"，平时为0）；
+        # 预先画好的连线随背景层一起贴上，耗时计入 "background"
+        with profiler.phase("rebuild"):
+            static_layer.ensure(surface, self.planets, background_image)
+        with profiler.phase("background"):
+            surface.blit(static_layer.surface, (0, 0))
         
-        if player_planets == 0 and len([f for f in self.fleets if f.owner == 1]) == 0:
-            self.game_over = True
-            self.winner = 2
-        elif enemy_planets == 0 and len([f for f in self.fleets if f.owner == 2]) == 0:
-            self.game_over = True
-            self.winner = 1
+        with profiler.phase("planets"):
+            for planet in self.planets:
+                planet.draw(surface)
             
-        if self.turn_count % 60 == 0:
-            self.ai_turn()
+        with profiler.phase("fleets"):
+            for fleet in self.fleet_sprites():
+                fleet.draw(surface)
             
-        self.turn_count += 1
+        with profiler.phase("hud"):
+            self.draw_hud(surface)
+
+        if self.game_over:
+            self.draw_game_over(surface)
+
+    # 本帧要画的舰队组：每条航线上相隔不久的发射已合并成一组，一组只画一条线段、一个圆点和一个总数
+    def fleet_sprites(self):
+        tick = self.turn_count + self.render_alpha
+        for fleet in self.fleets:
+            fleet.move_to(tick)
+        return list(self.fleets)
+
+    def status_text(self):
+        neutral_planets, player_planets, enemy_planets = self.planet_counts
+        return f"玩家星球: {player_planets} | 敌人星球: {enemy_planets} | 中立星球: {neutral_planets}"
+
+    def draw_hud(self, surface):
+        text = text_cache.render(font, self.status_text(), WHITE)
+        surface.blit(text, (10, 10))
+
+    def hud_bounds(self):
+        text = text_cache.render(font, self.status_text(), WHITE)
+        return text.get_rect(topleft=(10, 10))
+
+    def draw_game_over(self, surface):
+        surface.blit(sprites.overlay((WIDTH, HEIGHT), (0, 0, 0, 180)), (0, 0))
         
-    def ai_turn(self):
-        enemy_planets = [p for p in self.planets if p.owner == 2]
-        if not enemy_planets:
-            return
-            
-        if random.random() < 0.5:
-            source_planet = random.choice(enemy_planets)
-            if source_planet.ships > 1:
-                possible_targets = [p for p in self.planets if p.owner != 2]
-                if possible_targets:
-                    target_planet = random.choice(possible_targets)
-                    ships_to_send = source_planet.ships // 2
-                    if ships_to_send > 0:
-                        source_planet.ships -= ships_to_send
-                        self.fleets.append(Fleet(source_planet, target_planet, ships_to_send, 2))
+        if self.winner == 1:
+            result_text = "你赢了!"
+            color = PLAYER_COLOR
         else:
-            ai_planets = [p for p in self.planets if p.owner == 2]
-            if len(ai_planets) > 1:
-                source_planet = max(ai_planets, key=lambda p: p.ships)
-                target_planet = min(ai_planets, key=lambda p: p.ships)
-
-                if source_planet != target_planet and source_planet.ships > 1:
-                    ships_to_send = source_planet.ships // 2
-                    source_planet.ships -= ships_to_send
-                    self.fleets.append(Fleet(source_planet, target_planet, ships_to_send, 2))
-                
-    def produce_ships(self):
-        for planet in self.planets:
-            planet.produce_ships()
-            
-    def draw(self, surface):
-        if background_image:
-            surface.blit(background_image, (0, 0))
-        else:
-            surface.fill(BLACK)
-        
-        for i, planet1 in enumerate(self.planets):
-            for planet2 in self.planets[i+1:]:
-                pygame.draw.line(surface, LINE_COLOR, (planet1.x, planet1.y), (planet2.x, planet2.y), 1)
-        
-        for planet in self.planets:
-            planet.draw(surface)
-            
-        for fleet in self.fleets:
-            fleet.draw(surface)
+            result_text = "你输了!"
+            color = ENEMY_COLOR
             
-        player_planets = sum(1 for p in self.planets if p.owner == 1)
-        enemy_planets = sum(1 for p in self.planets if p.owner == 2)
-        neutral_planets = sum(1 for p in self.planets if p.owner == 0)
+        text = text_cache.render(large_font, result_text, color)
+        text_rect = text.get_rect(center=(WIDTH//2, HEIGHT//2))
+        surface.blit(text, text_rect)
         
-        status_text = f"玩家星球: {player_planets} | 敌人星球: {enemy_planets} | 中立星球: {neutral_planets}"
-        text = font.render(status_text, True, WHITE)
-        surface.blit(text, (10, 10))
+        restart_text = text_cache.render(font, "按空格键重新开始", WHITE)
+        restart_rect = restart_text.get_rect(center=(WIDTH//2, HEIGHT//2 + 50))
+        surface.blit(restart_text, restart_rect)
 
-        if self.game_over:
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            surface.blit(overlay, (0, 0))
-            
-            if self.winner == 1:
-                result_text = "你赢了!"
-                color = PLAYER_COLOR
-            else:
-                result_text = "你输了!"
-                color = ENEMY_COLOR
-                
-            text = large_font.render(result_text, True, color)
-            text_rect = text.get_rect(center=(WIDTH//2, HEIGHT//2))
-            surface.blit(text, text_rect)
-            
-            restart_text = font.render("按空格键重新开始", True, WHITE)
-            restart_rect = restart_text.get_rect(center=(WIDTH//2, HEIGHT//2 + 50))
-            surface.blit(restart_text, restart_rect)
+# 性能面板：各阶段 p50/p99 耗时和内存块净变化
+class PerfHud:
+    PHASES = ("total", "events", "update", "ai", "render", "rebuild", "background", "planets", "fleets", "hud", "flip")
+    REFRESH = 30  # 每隔多少帧刷新一次面板内容
+
+    def __init__(self):
+        self.visible = False
+        self.surface = None
+        self.rect = None
+        self.frames_since_refresh = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.surface = None
+
+    def refresh(self, profiler):
+        summary = profiler.summary()
+        lines = ["阶段        p50(ms)  p99(ms)"]
+        for name in self.PHASES:
+            if name in summary:
+                stats = summary[name]
+                lines.append(f"{name:<10} {stats['p50'] * 1000:8.2f} {stats['p99'] * 1000:8.2f}")
+        if "net_blocks" in summary:
+            stats = summary["net_blocks"]
+            lines.append(f"内存块净增/帧 p50 {stats['p50']:.0f}  p99 {stats['p99']:.0f}")
+        if "gc0" in summary:
+            lines.append(f"GC/帧       平均 {summary['gc0']['mean']:.2f}")
+
+        texts = [font.render(line, True, WHITE) for line in lines]
+        width = max(text.get_width() for text in texts) + 12
+        height = sum(text.get_height() for text in texts) + 12
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        y = 6
+        for text in texts:
+            panel.blit(text, (6, y))
+            y += text.get_height()
+        self.surface = panel
+        self.rect = panel.get_rect(topright=(WIDTH - 10, 10))
+
+    def draw(self, surface, profiler):
+        self.frames_since_refresh += 1
+        if self.surface is None or self.frames_since_refresh >= self.REFRESH:
+            self.refresh(profiler)
+            self.frames_since_refresh = 0
+        surface.blit(self.surface, self.rect)
+        return self.rect
+
+# 第 n 局的回放文件名：game.rpl, game-2.rpl, game-3.rpl ...
+def numbered_path(path, n):
+    if n == 1:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}-{n}{ext}"
+
+# 种子写进回放文件头（无符号64位），超出范围的在解析参数时就拒绝
+def seed_arg(value):
+    seed = int(value)
+    if not 0 <= seed < 2 ** 64:
+        raise argparse.ArgumentTypeError(f"种子必须在 0 到 2^64-1 之间: {value}")
+    return seed
 
 # 主游戏循环
 def main():
+    parser = argparse.ArgumentParser(description="行星战争")
+    parser.add_argument("--renderer", choices=("full", "dirty"), default="full",
+                        help="full: 每帧整屏重画; dirty: 只提交变化区域（适合低功耗机器）")
+    parser.add_argument("--sim-rate", type=int, default=SIM_RATE, help="每秒逻辑帧数")
+    parser.add_argument("--fps", type=int, default=60, help="渲染帧率上限")
+    parser.add_argument("--speed", type=int, default=1, help="快进倍数（运行中用 [ 和 ] 调整）")
+    parser.add_argument("--spectate", action="store_true", help="观战模式：双方都由AI控制")
+    parser.add_argument("--profile", action="store_true", help="启动时打开性能面板（也可按 F3 切换）")
+    parser.add_argument("--profile-out", metavar="PATH", help="退出时把逐帧统计导出为 CSV（或 .json）")
+    parser.add_argument("--seed", type=seed_arg, help="第一局的随机种子（地图和AI）")
+    parser.add_argument("--record", metavar="PATH", help="把对局录制为回放文件，重新开始后依次编号")
+    parser.add_argument("--replay", metavar="PATH", help="播放回放文件（← / → 后退/前进10秒）")
+    parser.add_argument("--ai", choices=("random", "search"), default="random", help="敌方AI")
+    parser.add_argument("--ai-budget", type=float, default=0.2, help="搜索AI每次决策的时间预算（秒）")
+    args = parser.parse_args()
+
+    startup_timings = init_display()
+
+    ai_players = (core.PLAYER, core.ENEMY) if args.spectate else (core.ENEMY,)
     clock = pygame.time.Clock()
-    game = Game()
-    production_timer = 0
+    timestep = FixedTimestep(args.sim_rate, args.speed)
+    replay_player = None
+    recorder = None
+    matches = 1
+    # 搜索AI在后台进程里运行，不阻塞渲染
+    search_ai = None
+    if args.ai == "search":
+        from search_ai import SearchAI
+        search_ai = SearchAI(budget=args.ai_budget, mode="process")
+    if args.replay:
+        replay_player = ReplayPlayer(Replay.load(args.replay), Game)
+        game = replay_player.game
+    else:
+        game = Game(seed=args.seed, ai_players=ai_players)
+        if search_ai:
+            game.ai_controllers[core.ENEMY] = search_ai
+        if args.record:
+            recorder = ReplayRecorder(args.record, game)
+    renderer = DirtyRenderer(static_layer, background_image) if args.renderer == "dirty" else None
+    first_frame = True
+
+    global profiler
+    profiler = FrameProfiler(enabled=args.profile or bool(args.profile_out), record=bool(args.profile_out))
+    perf_hud = PerfHud()
+    perf_hud.visible = args.profile
     
     running = True
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            
-            elif event.type == pygame.MOUSEBUTTONUP:
-                if game.game_over:
-                    continue
+        profiler.begin_frame()
+
+        with profiler.phase("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
                 
-                clicked_planet = game.select_planet(event.pos)
-
-                if game.selected_planet:
-                    if clicked_planet and clicked_planet != game.selected_planet:
-                        ships_to_send = game.selected_planet.ships // 2
-                        if ships_to_send > 0:
-                            game.selected_planet.ships -= ships_to_send
-                            game.fleets.append(Fleet(game.selected_planet, clicked_planet, ships_to_send, game.selected_planet.owner))
-                        
-                        game.selected_planet.selected = False
-                        game.selected_planet = None
+                elif event.type == pygame.MOUSEBUTTONUP:
+                    if game.game_over or args.spectate or replay_player:
+                        continue
+                    
+                    clicked_planet = game.select_planet(event.pos)
+
+                    if game.selected_planet:
+                        if clicked_planet and clicked_planet != game.selected_planet:
+                            ships_to_send = game.selected_planet.ships // 2
+                            if ships_to_send > 0:
+                                game.launch_fleet(game.selected_planet, clicked_planet, ships_to_send, game.selected_planet.owner)
+                            
+                            game.selected_planet.selected = False
+                            game.selected_planet = None
+                        else:
+                            game.selected_planet.selected = False
+                            game.selected_planet = None
                     else:
-                        game.selected_planet.selected = False
-                        game.selected_planet = None
-                else:
-                    if clicked_planet and clicked_planet.owner == 1:
-                        game.selected_planet = clicked_planet
-                        game.selected_planet.selected = True
-            
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE and game.game_over:
-                    game = Game()
+                        if clicked_planet and clicked_planet.owner == 1:
+                            game.selected_planet = clicked_planet
+                            game.selected_planet.selected = True
+                
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE and game.game_over and not replay_player:
+                        if recorder:
+                            recorder.close()
+                        game = Game(ai_players=ai_players)
+                        if search_ai:
+                            game.ai_controllers[core.ENEMY] = search_ai
+                        matches += 1
+                        if args.record:
+                            recorder = ReplayRecorder(numbered_path(args.record, matches), game)
+                        timestep.reset()
+                    elif event.key in (pygame.K_LEFT, pygame.K_RIGHT) and replay_player:
+                        offset = args.sim_rate * 10 if event.key == pygame.K_RIGHT else -args.sim_rate * 10
+                        game = replay_player.seek(max(0, game.turn_count + offset))
+                        if renderer:
+                            renderer.invalidate()
+                    elif event.key == pygame.K_RIGHTBRACKET:
+                        timestep.faster()
+                    elif event.key == pygame.K_LEFTBRACKET:
+                        timestep.slower()
+                    elif event.key == pygame.K_F3:
+                        perf_hud.toggle()
+                        profiler.enabled = perf_hud.visible or bool(args.profile_out)
+                        if renderer and perf_hud.rect:
+                            renderer.mark_dirty(perf_hud.rect)
         
-        production_timer += 1
-        if production_timer >= 300:
-            game.produce_ships()
-            production_timer = 0
-            
-        if not game.game_over:
-            game.update()
+        # 按真实时间推进固定步长的逻辑帧，与渲染帧率无关
+        with profiler.phase("update"):
+            for _ in range(timestep.advance()):
+                if replay_player:
+                    if replay_player.finished:
+                        break
+                    replay_player.step()
+                else:
+                    game.tick()
+        game.render_alpha = 0.0 if game.game_over else timestep.alpha
             
-        game.draw(screen)
-        
-        pygame.display.flip()
-        clock.tick(60)
+        if renderer:
+            if perf_hud.visible and perf_hud.rect:
+                renderer.mark_dirty(perf_hud.rect)
+            with profiler.phase("render"):
+                rects = renderer.render(game, screen)
+            if perf_hud.visible:
+                hud_rect = perf_hud.draw(screen, profiler)
+                if rects is not None:
+                    rects.append(hud_rect)
+            with profiler.phase("flip"):
+                renderer.present(rects)
+        else:
+            game.draw(screen)
+            if perf_hud.visible:
+                perf_hud.draw(screen, profiler)
+            with profiler.phase("flip"):
+                pygame.display.flip()
+        profiler.end_frame()
+        if first_frame:
+            first_frame = False
+            details = " | ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in startup_timings.items())
+            print(f"启动到第一帧: {(time.perf_counter() - STARTUP_START) * 1000:.0f}ms ({details})")
+        clock.tick(args.fps)
+
+    if recorder:
+        recorder.close()
+    if search_ai:
+        stats = search_ai.stats()
+        print(f"搜索AI: {stats['decisions']} 次决策 | {stats['rollouts']} 次推演 | "
+              f"{stats['ticks_per_sec']:.0f} 模拟帧/秒")
+        search_ai.close()
+    if args.profile_out:
+        profiler.export(args.profile_out)
         
     pygame.quit()
     sys.exit()
@@ -0,0 +1,330 @@
+import heapq
+import random
+import math
+
+from spatial import SpatialGrid, poisson_disk_sample
+
+# 地图尺寸（与窗口大小一致）
+WIDTH, HEIGHT = 1000, 700
+
+# 颜色定义
+PLAYER_COLOR = (78, 192, 255)  # 玩家颜色
+ENEMY_COLOR = (255, 96, 96)   # 敌人颜色
+NEUTRAL_COLOR = (180, 180, 180) # 中立颜色
+
+# 归属
+NEUTRAL, PLAYER, ENEMY = 0, 1, 2
+
+# 节奏（单位：逻辑帧）
+PRODUCTION_INTERVAL = 300  # 每隔多少帧生产一次飞船
+AI_INTERVAL = 60           # 每隔多少帧AI行动一次
+MERGE_WINDOW = AI_INTERVAL # 同一航线上相隔不超过多少帧的发射合并为一组（AI每回合的连续发射也能合并）
+
+# 地图生成
+MIN_PLANET_DISTANCE = 100  # 星球中心之间的最小距离
+MIN_PLANET_RADIUS = 20
+MAX_PLANET_RADIUS = 40
+
+# 星球类（纯逻辑，不依赖pygame）
+class Planet:
+    def __init__(self, x, y, radius, owner, ships, production_rate):
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.owner = owner  # 0: 中立, 1: 玩家, 2: 敌人
+        self.ships = ships
+        self.production_rate = production_rate
+        self.selected = False
+        self.color = self.get_color()
+        self.glow_radius = radius + 5
+        self.glow_color = self.color
+        self.index = None  # 在 Game.planets 中的下标，由 Game 设置
+
+    def get_color(self):
+        if self.owner == NEUTRAL:
+            return NEUTRAL_COLOR
+        elif self.owner == PLAYER:
+            return PLAYER_COLOR
+        else:
+            return ENEMY_COLOR
+
+    def produce_ships(self):
+        if self.owner != NEUTRAL:
+            self.ships += self.production_rate
+
+    def is_clicked(self, pos):
+        return (pos[0] - self.x) ** 2 + (pos[1] - self.y) ** 2 <= self.radius ** 2
+
+# 舰队类（纯逻辑，不依赖pygame）
+# 舰队越大越慢（每帧前进的航程比例）
+def fleet_speed(ships):
+    BASE_SPEED = 0.015
+    SPEED_FACTOR = 1000
+
+    speed_modifier = math.log(ships + 1) / SPEED_FACTOR
+    return max(BASE_SPEED - speed_modifier, 0.001)
+
+def travel_ticks(speed):
+    return math.ceil(1 / speed)
+
+# 同一航线上的一组舰队：每次发射是一波 (发射帧, 到达帧, 飞船数, 速度)，
+# 速度按这一波的飞船数在发射时确定，合并只是把几波放进同一个对象，不改变它们的航程和到达帧
+class Fleet:
+    def __init__(self, start_planet, end_planet, ships, owner, launch_tick=0, arrival_tick=None):
+        self.start_planet = start_planet
+        self.end_planet = end_planet
+        self.owner = owner
+        self.color = PLAYER_COLOR if owner == PLAYER else ENEMY_COLOR
+        self.x = self.tail_x = start_planet.x
+        self.y = self.tail_y = start_planet.y
+        self.progress = 0
+        self.ships = 0     # 在途各波的飞船总数
+        self.waves = []    # 按发射顺序
+        self.launches = 0  # 合并进这一组的发射次数
+        self.add_wave(ships, launch_tick, arrival_tick)
+
+    def add_wave(self, ships, launch_tick, arrival_tick=None):
+        speed = fleet_speed(ships)
+        if arrival_tick is None:
+            arrival_tick = launch_tick + travel_ticks(speed)
+        wave = (launch_tick, arrival_tick, ships, speed)
+        self.waves.append(wave)
+        self.ships += ships
+        self.launches += 1
+        return wave
+
+    def remove_wave(self, wave):
+        self.waves.remove(wave)
+        self.ships -= wave[2]
+
+    # 最近一次发射的帧（判断新的发射能否并入）
+    @property
+    def launch_tick(self):
+        return self.waves[-1][0]
+
+    # 航线：同一归属从同一星球飞往同一星球
+    def route(self):
+        return (self.start_planet, self.end_planet, self.owner)
+
+    @staticmethod
+    def wave_progress(wave, tick):
+        launch_tick, _, _, speed = wave
+        return min((tick - launch_tick) * speed, 1)
+
+    # 领头一波的进度
+    def progress_at(self, tick):
+        return max(self.wave_progress(wave, tick) for wave in self.waves)
+
+    # 按需计算位置，只有要绘制的舰队才需要调用；(x, y) 是领头一波，(tail_x, tail_y) 是最后一波
+    def move_to(self, tick):
+        progress = [self.wave_progress(wave, tick) for wave in self.waves]
+        self.progress = max(progress)
+        tail = min(progress)
+        dx = self.end_planet.x - self.start_planet.x
+        dy = self.end_planet.y - self.start_planet.y
+        self.x = self.start_planet.x + dx * self.progress
+        self.y = self.start_planet.y + dy * self.progress
+        self.tail_x = self.start_planet.x + dx * tail
+        self.tail_y = self.start_planet.y + dy * tail
+
+    def arrive(self, ships):
+        if self.end_planet.owner == self.owner:
+            self.end_planet.ships += ships
+        else:
+            if ships > self.end_planet.ships:
+                self.end_planet.owner = self.owner
+                self.end_planet.ships = ships - self.end_planet.ships
+                self.end_planet.color = self.end_planet.get_color()
+            else:
+                self.end_planet.ships -= ships
+
+# 游戏类（纯逻辑，不依赖pygame）
+# 前端通过覆盖 planet_class / fleet_class 挂上绘制方法
+class Game:
+    planet_class = Planet
+    fleet_class = Fleet
+
+    def __init__(self, seed=None, ai_players=(ENEMY,), num_planets=10, width=WIDTH, height=HEIGHT,
+                 min_distance=MIN_PLANET_DISTANCE, merge_window=MERGE_WINDOW):
+        # 没有指定种子时也随机选一个并记下来，保证每一局都可以复现
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.ai_players = tuple(ai_players)
+        self.ai_controllers = {}  # 归属 -> 自定义AI（例如 search_ai.SearchAI），未设置时用默认的随机策略
+        self.num_planets = num_planets
+        self.width = width
+        self.height = height
+        self.min_distance = min_distance
+        self.planets = []
+        self.fleets = {}       # 按发射顺序排列的在途舰队（dict 当作有序集合用，删除为 O(1)）
+        self.arrivals = []     # (到达帧, 发射序号, 舰队, 波) 的小顶堆，每次发射一项
+        self.launch_seq = 0
+        self.lanes = {}        # 航线 -> 该航线上按发射顺序排列的在途舰队组
+        self.merge_window = merge_window
+        self.planet_counts = [0, 0, 0]  # 按归属统计的星球数
+        self.fleet_counts = [0, 0, 0]   # 按归属统计的在途舰队组数
+        self.selected_planet = None
+        self.game_over = False
+        self.winner = None
+        self.turn_count = 0
+        self.production_timer = 0
+        self.recorder = None   # 回放记录器（见 replay.py）
+        self.setup_game()
+
+    def setup_game(self):
+        rng = self.rng
+        self.planets = []
+        self.planet_index = SpatialGrid(self.width, self.height, MAX_PLANET_RADIUS * 2)
+        points = poisson_disk_sample(rng, self.width, self.height, self.min_distance, self.num_planets)
+        for i, (x, y) in enumerate(points):
+            radius = rng.randint(MIN_PLANET_RADIUS, MAX_PLANET_RADIUS)
+            owner = NEUTRAL
+            if i == 0:
+                owner = PLAYER
+            elif i == 1:
+                owner = ENEMY
+
+            ships = rng.randint(10, 50) if owner != NEUTRAL else rng.randint(5, 20)
+            production_rate = rng.randint(1, 5)
+            planet = self.planet_class(x, y, radius, owner, ships, production_rate)
+            planet.index = i
+            self.planets.append(planet)
+            self.planet_index.insert(planet, x, y)
+        self.recount()
+
+    # 全量重新统计（只在直接改动了星球/舰队状态之后需要调用）
+    def recount(self):
+        self.planet_counts = [0, 0, 0]
+        for planet in self.planets:
+            self.planet_counts[planet.owner] += 1
+        self.fleet_counts = [0, 0, 0]
+        for fleet in self.fleets:
+            self.fleet_counts[fleet.owner] += 1
+
+    def select_planet(self, pos):
+        for _, _, planet in self.planet_index.nearby(pos[0], pos[1], MAX_PLANET_RADIUS):
+            if planet.is_clicked(pos):
+                return planet
+        return None
+
+    def launch_fleet(self, source_planet, target_planet, ships, owner):
+        if self.recorder:
+            self.recorder.record_launch(self.turn_count, source_planet.index, target_planet.index, ships, owner)
+        source_planet.ships -= ships
+
+        # 同一航线上最近一组的上一次发射不久前才出发：作为新的一波并入该组
+        lane = self.lanes.get((source_planet, target_planet, owner))
+        if lane:
+            latest = next(reversed(lane))
+            if self.turn_count - latest.launch_tick <= self.merge_window:
+                self.schedule(latest, latest.add_wave(ships, self.turn_count))
+                return latest
+
+        fleet = self.fleet_class(source_planet, target_planet, ships, owner, self.turn_count)
+        self.add_fleet(fleet)
+        return fleet
+
+    def add_fleet(self, fleet):
+        self.fleets[fleet] = None
+        self.lanes.setdefault(fleet.route(), {})[fleet] = None
+        self.fleet_counts[fleet.owner] += 1
+        for wave in fleet.waves:
+            self.schedule(fleet, wave)
+
+    # 把一波放进到达队列，发射序号决定同一帧到达时的结算顺序
+    def schedule(self, fleet, wave):
+        heapq.heappush(self.arrivals, (wave[1], self.launch_seq, fleet, wave))
+        self.launch_seq += 1
+
+    def clear_fleets(self):
+        self.fleets = {}
+        self.lanes = {}
+        self.arrivals = []
+        self.fleet_counts = [0, 0, 0]
+
+    # 结算所有已经到期的波，同一帧内按发射顺序结算；一组的最后一波到达后移除该组
+    def resolve_arrivals(self):
+        arrivals = self.arrivals
+        while arrivals and arrivals[0][0] <= self.turn_count:
+            _, _, fleet, wave = heapq.heappop(arrivals)
+            fleet.remove_wave(wave)
+            if not fleet.waves:
+                del self.fleets[fleet]
+                self.fleet_counts[fleet.owner] -= 1
+                route = fleet.route()
+                lane = self.lanes[route]
+                del lane[fleet]
+                if not lane:
+                    del self.lanes[route]
+
+            planet = fleet.end_planet
+            old_owner = planet.owner
+            fleet.arrive(wave[2])
+            if planet.owner != old_owner:
+                self.planet_counts[old_owner] -= 1
+                self.planet_counts[planet.owner] += 1
+
+    # 推进一个逻辑帧：计时生产 + 更新
+    def tick(self):
+        if self.recorder:
+            self.recorder.before_tick(self)
+
+        self.production_timer += 1
+        if self.production_timer >= PRODUCTION_INTERVAL:
+            self.produce_ships()
+            self.production_timer = 0
+
+        if not self.game_over:
+            self.update()
+
+    def update(self):
+        self.turn_count += 1
+        self.resolve_arrivals()
+
+        if self.planet_counts[PLAYER] == 0 and self.fleet_counts[PLAYER] == 0:
+            self.game_over = True
+            self.winner = ENEMY
+        elif self.planet_counts[ENEMY] == 0 and self.fleet_counts[ENEMY] == 0:
+            self.game_over = True
+            self.winner = PLAYER
+
+        # AI 在第 0, 60, 120... 帧的末尾行动；此时 turn_count 已经加一，
+        # 与两帧之间由玩家发出的舰队使用同一个发射帧
+        if (self.turn_count - 1) % AI_INTERVAL == 0:
+            for owner in self.ai_players:
+                self.ai_turn(owner)
+
+    def ai_turn(self, owner=ENEMY):
+        controller = self.ai_controllers.get(owner)
+        if controller:
+            controller.act(self, owner)
+            return
+
+        rng = self.rng
+        ai_planets = [p for p in self.planets if p.owner == owner]
+        if not ai_planets:
+            return
+
+        if rng.random() < 0.5:
+            source_planet = rng.choice(ai_planets)
+            if source_planet.ships > 1:
+                possible_targets = [p for p in self.planets if p.owner != owner]
+                if possible_targets:
+                    target_planet = rng.choice(possible_targets)
+                    ships_to_send = source_planet.ships // 2
+                    if ships_to_send > 0:
+                        self.launch_fleet(source_planet, target_planet, ships_to_send, owner)
+        else:
+            if len(ai_planets) > 1:
+                source_planet = max(ai_planets, key=lambda p: p.ships)
+                target_planet = min(ai_planets, key=lambda p: p.ships)
+
+                if source_planet != target_planet and source_planet.ships > 1:
+                    ships_to_send = source_planet.ships // 2
+                    self.launch_fleet(source_planet, target_planet, ships_to_send, owner)
+
+    def produce_ships(self):
+        for planet in self.planets:
+            planet.produce_ships()
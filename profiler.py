@@ -0,0 +1,122 @@
+import csv
+import gc
+import json
+import sys
+import time
+from collections import deque
+
+# 逐帧性能统计：各阶段耗时、内存块净变化、GC次数，可导出 CSV/JSON
+# 阶段计时是包含式的：嵌套的阶段（例如 update 里的 ai）同时计入外层阶段
+# net_blocks 是一帧前后 sys.getallocatedblocks() 的差，只反映净增长（泄漏、缓存变大），
+# 帧内创建又释放的临时对象不计入，不是分配次数；分配多少看 gc0（第0代回收次数）
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + elapsed
+        return False
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class FrameProfiler:
+    # history: 保留最近多少帧用于统计；record=True 时保留全部帧用于导出
+    def __init__(self, history=600, enabled=True, record=False):
+        self.enabled = enabled
+        self.frames = deque(maxlen=None if record else history)
+        self.current = {}
+        self.frame_index = 0
+        self.frame_start = 0.0
+        self.blocks_start = 0
+        self.gc_start = 0
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        return _Phase(self, name)
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {}
+        self.frame_start = time.perf_counter()
+        self.blocks_start = sys.getallocatedblocks()
+        self.gc_start = gc.get_stats()[0]["collections"]
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        record = {
+            "frame": self.frame_index,
+            "total": time.perf_counter() - self.frame_start,
+            "net_blocks": sys.getallocatedblocks() - self.blocks_start,
+            "gc0": gc.get_stats()[0]["collections"] - self.gc_start,
+        }
+        record.update(self.current)
+        self.frames.append(record)
+        self.frame_index += 1
+
+    def phase_names(self):
+        names = []
+        for frame in self.frames:
+            for name in frame:
+                if name not in names:
+                    names.append(name)
+        return names
+
+    # 每个字段的 p50/p99（单位：秒；net_blocks/gc0 为计数）
+    def summary(self):
+        result = {}
+        for name in self.phase_names():
+            if name == "frame":
+                continue
+            values = [frame.get(name, 0.0) for frame in self.frames]
+            result[name] = {"p50": percentile(values, 50), "p99": percentile(values, 99),
+                            "mean": sum(values) / len(values)}
+        return result
+
+    def export_csv(self, path):
+        names = self.phase_names()
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=names, restval=0.0)
+            writer.writeheader()
+            writer.writerows(self.frames)
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump({"frames": list(self.frames), "summary": self.summary()}, f, indent=1)
+
+    def export(self, path):
+        if path.endswith(".json"):
+            self.export_json(path)
+        else:
+            self.export_csv(path)
@@ -0,0 +1,124 @@
+from collections import OrderedDict
+
+import pygame
+
+# 渲染缓存：文字、光晕/星球环精灵、静态背景层
+
+
+# 有上限的LRU文字缓存：数字和HUD文字只在内容变化时重新渲染
+class TextCache:
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+# 预先烘焙的透明精灵，按 (半径, 颜色) 缓存
+class SpriteCache:
+    def __init__(self):
+        self.sprites = {}
+
+    def _new_surface(self, radius):
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+            surface.fill((0, 0, 0, 0))
+        return surface
+
+    def glow(self, radius, color, alpha=50):
+        key = ("glow", radius, color, alpha)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self._new_surface(radius)
+            pygame.draw.circle(sprite, (color[0], color[1], color[2], alpha), (radius, radius), radius)
+            self.sprites[key] = sprite
+        return sprite
+
+    def ring(self, radius, color, width=2):
+        key = ("ring", radius, color, width)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self._new_surface(radius)
+            pygame.draw.circle(sprite, color, (radius, radius), radius, width)
+            self.sprites[key] = sprite
+        return sprite
+
+    # 整屏半透明遮罩（游戏结束画面）
+    def overlay(self, size, color):
+        key = ("overlay", size, color)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface(size, pygame.SRCALPHA)
+            sprite.fill(color)
+            self.sprites[key] = sprite
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+
+
+# 背景图 + 星球连线，只在地图变化（星球位置变化）时重新合成
+class StaticLayer:
+    def __init__(self, line_color, fill_color=(0, 0, 0)):
+        self.line_color = line_color
+        self.fill_color = fill_color
+        self.surface = None
+        self.key = None
+        self.rebuilds = 0
+
+    def map_key(self, planets, background_image, size):
+        return (size, id(background_image), tuple((p.x, p.y) for p in planets))
+
+    def rebuild(self, planets, background_image, target):
+        size = target.get_size()
+        layer = pygame.Surface(size, 0, target)
+        if background_image:
+            layer.blit(background_image, (0, 0))
+        else:
+            layer.fill(self.fill_color)
+
+        for i, planet1 in enumerate(planets):
+            for planet2 in planets[i+1:]:
+                pygame.draw.line(layer, self.line_color, (planet1.x, planet1.y), (planet2.x, planet2.y), 1)
+
+        self.surface = layer
+        self.rebuilds += 1
+
+    # 地图变化时重建，返回是否发生了重建
+    def ensure(self, surface, planets, background_image):
+        key = self.map_key(planets, background_image, surface.get_size())
+        if key == self.key:
+            return False
+        self.rebuild(planets, background_image, surface)
+        self.key = key
+        return True
+
+    def draw(self, surface, planets, background_image):
+        self.ensure(surface, planets, background_image)
+        surface.blit(self.surface, (0, 0))
+
+    # 只恢复某块区域的背景
+    def restore(self, surface, rect):
+        surface.blit(self.surface, rect, rect)
+
+    def invalidate(self):
+        self.key = None
@@ -0,0 +1,297 @@
+import argparse
+import bisect
+import struct
+import time
+
+from game_core import Game
+
+# 紧凑的二进制回放：种子 + 地图参数 + 所有发射指令 (帧, 出发星球, 目标星球, 飞船数, 归属)
+# 另外每隔 snapshot_interval 帧写一份完整状态快照，回放时可以从最近的快照开始，
+# 跳转到任意帧最多只需重新模拟 snapshot_interval 帧
+#
+# 时序约定：指令的帧号是发射时的 turn_count；快照在 Game.tick() 开始时写入，
+# 此时该帧号的所有发射（上一帧AI的和两帧之间玩家的）都已包含在快照里
+
+MAGIC = b"PWRP"
+VERSION = 2
+DEFAULT_SNAPSHOT_INTERVAL = 600  # 按60帧/秒计算，每10秒一份快照
+
+HEADER = struct.Struct("<4sHQIIIdI")   # magic, version, seed, num_planets, width, height, min_distance, snapshot_interval
+RECORD_TYPE = struct.Struct("<B")
+LAUNCH = struct.Struct("<IIIIB")       # tick, source, target, ships, owner
+SNAPSHOT_HEAD = struct.Struct("<IIBBIII")  # tick, production_timer, game_over, winner, launch_seq, planets, fleets
+SNAPSHOT_PLANET = struct.Struct("<Bq")     # owner, ships
+SNAPSHOT_FLEET = struct.Struct("<IIIBdIII")  # 每一波: start, end, ships, owner, launch_tick, arrival_tick, seq, group
+END = struct.Struct("<IB")                # tick, winner
+
+TYPE_LAUNCH = ord("L")
+TYPE_SNAPSHOT = ord("S")
+TYPE_END = ord("E")
+NO_WINNER = 255
+
+
+class ReplayError(Exception):
+    pass
+
+
+# 录制：挂到 game.recorder 上，由 Game.launch_fleet / Game.tick 回调
+class ReplayRecorder:
+    def __init__(self, path, game, snapshot_interval=DEFAULT_SNAPSHOT_INTERVAL):
+        self.file = open(path, "wb")
+        self.snapshot_interval = snapshot_interval
+        self.last_snapshot = None
+        self.file.write(HEADER.pack(MAGIC, VERSION, game.seed, game.num_planets, game.width, game.height,
+                                    game.min_distance, snapshot_interval))
+        game.recorder = self
+        self.game = game
+
+    def record_launch(self, tick, source, target, ships, owner):
+        self.file.write(RECORD_TYPE.pack(TYPE_LAUNCH))
+        self.file.write(LAUNCH.pack(tick, source, target, ships, owner))
+
+    def before_tick(self, game):
+        tick = game.turn_count
+        if tick % self.snapshot_interval == 0 and tick != self.last_snapshot:
+            self.file.write(RECORD_TYPE.pack(TYPE_SNAPSHOT))
+            self.file.write(pack_snapshot(game))
+            self.last_snapshot = tick
+
+    def close(self):
+        if self.file.closed:
+            return
+        game = self.game
+        winner = NO_WINNER if game.winner is None else game.winner
+        self.file.write(RECORD_TYPE.pack(TYPE_END))
+        self.file.write(END.pack(game.turn_count, winner))
+        self.file.close()
+        game.recorder = None
+
+
+# 舰队按波（每次发射）写入，group 是所属舰队组按首次出现顺序的编号
+def pack_snapshot(game):
+    waves = sorted(game.arrivals, key=lambda entry: entry[1])
+    winner = NO_WINNER if game.winner is None else game.winner
+    parts = [SNAPSHOT_HEAD.pack(game.turn_count, game.production_timer, game.game_over, winner,
+                                game.launch_seq, len(game.planets), len(waves))]
+    for planet in game.planets:
+        parts.append(SNAPSHOT_PLANET.pack(planet.owner, planet.ships))
+    groups = {}
+    for arrival_tick, seq, fleet, wave in waves:
+        group = groups.setdefault(fleet, len(groups))
+        launch_tick, _, ships, _ = wave
+        parts.append(SNAPSHOT_FLEET.pack(fleet.start_planet.index, fleet.end_planet.index, ships,
+                                         fleet.owner, launch_tick, arrival_tick, seq, group))
+    return b"".join(parts)
+
+
+class Snapshot:
+    def __init__(self, tick, data, offset):
+        self.tick = tick
+        self.data = data
+        self.offset = offset
+
+    def restore(self, game):
+        (tick, production_timer, game_over, winner, launch_seq,
+         num_planets, num_fleets) = SNAPSHOT_HEAD.unpack_from(self.data, self.offset)
+        offset = self.offset + SNAPSHOT_HEAD.size
+        for planet in game.planets[:num_planets]:
+            planet.owner, planet.ships = SNAPSHOT_PLANET.unpack_from(self.data, offset)
+            planet.color = planet.get_color()
+            planet.selected = False
+            offset += SNAPSHOT_PLANET.size
+
+        game.clear_fleets()
+        game.launch_seq = 0
+        groups = []
+        for _ in range(num_fleets):
+            (start, end, ships, owner, launch_tick, arrival_tick,
+             _, group) = SNAPSHOT_FLEET.unpack_from(self.data, offset)
+            offset += SNAPSHOT_FLEET.size
+            if group < len(groups):
+                fleet = groups[group]
+                game.schedule(fleet, fleet.add_wave(ships, launch_tick, arrival_tick))
+            else:
+                fleet = game.fleet_class(game.planets[start], game.planets[end], ships, owner,
+                                         launch_tick, arrival_tick)
+                groups.append(fleet)
+                game.add_fleet(fleet)
+
+        game.launch_seq = launch_seq
+        game.turn_count = tick
+        game.production_timer = production_timer
+        game.game_over = bool(game_over)
+        game.winner = None if winner == NO_WINNER else winner
+        game.selected_planet = None
+        game.recount()
+
+
+class Replay:
+    def __init__(self, seed, num_planets, width, height, min_distance, snapshot_interval):
+        self.seed = seed
+        self.num_planets = num_planets
+        self.width = width
+        self.height = height
+        self.min_distance = min_distance
+        self.snapshot_interval = snapshot_interval
+        self.commands = []      # (tick, source, target, ships, owner)，按录制顺序
+        self.command_ticks = []
+        self.snapshots = []
+        self.snapshot_ticks = []
+        self.end_tick = None    # 录制被中断（进程被杀、没有调用 close）时没有结束记录，保持 None
+        self.winner = None
+        self.truncated = False  # 文件末尾有不完整的记录（已忽略）
+
+    # 最后一条记录所在的帧：没有结束记录时播放到这里为止
+    @property
+    def last_tick(self):
+        if self.end_tick is not None:
+            return self.end_tick
+        ticks = [0]
+        if self.command_ticks:
+            ticks.append(self.command_ticks[-1])
+        if self.snapshot_ticks:
+            ticks.append(self.snapshot_ticks[-1])
+        return max(ticks)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ReplayError(f"{path}: 文件太短")
+        magic, version, *params = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ReplayError(f"{path}: 不是回放文件")
+        if version != VERSION:
+            raise ReplayError(f"{path}: 不支持的回放版本 {version}")
+        replay = cls(*params)
+
+        # 录制中断时最后一条记录可能不完整：读到最后一条完整的记录为止
+        offset = HEADER.size
+        size = len(data)
+        while offset < size:
+            (record_type,) = RECORD_TYPE.unpack_from(data, offset)
+            offset += RECORD_TYPE.size
+            if record_type == TYPE_LAUNCH:
+                if offset + LAUNCH.size > size:
+                    replay.truncated = True
+                    break
+                command = LAUNCH.unpack_from(data, offset)
+                replay.commands.append(command)
+                replay.command_ticks.append(command[0])
+                offset += LAUNCH.size
+            elif record_type == TYPE_SNAPSHOT:
+                if offset + SNAPSHOT_HEAD.size > size:
+                    replay.truncated = True
+                    break
+                tick, _, _, _, _, num_planets, num_fleets = SNAPSHOT_HEAD.unpack_from(data, offset)
+                length = (SNAPSHOT_HEAD.size + num_planets * SNAPSHOT_PLANET.size
+                          + num_fleets * SNAPSHOT_FLEET.size)
+                if offset + length > size:
+                    replay.truncated = True
+                    break
+                replay.snapshots.append(Snapshot(tick, data, offset))
+                replay.snapshot_ticks.append(tick)
+                offset += length
+            elif record_type == TYPE_END:
+                if offset + END.size > size:
+                    replay.truncated = True
+                    break
+                replay.end_tick, winner = END.unpack_from(data, offset)
+                replay.winner = None if winner == NO_WINNER else winner
+                offset += END.size
+            else:
+                raise ReplayError(f"{path}: 偏移 {offset - 1} 处的记录类型无效")
+        return replay
+
+    def new_game(self, game_class=Game):
+        # 回放时所有发射（包括AI的）都来自记录，不再运行AI
+        return game_class(seed=self.seed, ai_players=(), num_planets=self.num_planets,
+                          width=self.width, height=self.height, min_distance=self.min_distance)
+
+
+# 回放：按记录的指令推进游戏，可跳转到任意帧
+class ReplayPlayer:
+    def __init__(self, replay, game_class=Game):
+        self.replay = replay
+        self.game = replay.new_game(game_class)
+        self.cursor = 0
+
+    @property
+    def finished(self):
+        # 游戏结束后 turn_count 不再增加，所以结束判断也要看 game_over
+        end_tick = self.replay.end_tick
+        if end_tick is not None and self.game.turn_count >= end_tick:
+            return True
+        if self.cursor < len(self.replay.commands):
+            return False
+        # 没有结束记录（录制中断）：播放到最后一条记录所在的帧
+        return self.game.game_over or (end_tick is None and self.game.turn_count >= self.replay.last_tick)
+
+    # 执行帧号不晚于当前帧的所有指令
+    def apply_commands(self):
+        game = self.game
+        commands = self.replay.commands
+        while self.cursor < len(commands) and commands[self.cursor][0] <= game.turn_count:
+            _, source, target, ships, owner = commands[self.cursor]
+            game.launch_fleet(game.planets[source], game.planets[target], ships, owner)
+            self.cursor += 1
+
+    def step(self):
+        self.apply_commands()
+        self.game.tick()
+
+    # 从不晚于 tick 的最近快照开始，最多重新模拟 snapshot_interval 帧
+    def seek(self, tick):
+        game = self.game
+        snapshots = self.replay.snapshots
+        i = bisect.bisect_right(self.replay.snapshot_ticks, tick) - 1
+        if i >= 0 and not (snapshots[i].tick <= game.turn_count <= tick):
+            snapshots[i].restore(game)
+            self.cursor = bisect.bisect_right(self.replay.command_ticks, game.turn_count)
+        elif i < 0 and game.turn_count > tick:
+            self.game = self.replay.new_game(type(game))
+            self.cursor = 0
+            game = self.game
+        while game.turn_count < tick and not self.finished:
+            self.step()
+        # 与快照一致：返回的状态包含该帧的所有发射
+        self.apply_commands()
+        return game
+
+    def play_to_end(self):
+        while not self.finished:
+            self.step()
+        # 结束帧上AI的发射也要执行，与 seek() 一致
+        self.apply_commands()
+        return self.game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="行星战争回放工具（无窗口）")
+    parser.add_argument("path", help="回放文件")
+    parser.add_argument("--to", type=int, help="快进到指定帧并打印当时的状态；默认播放到结束")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    print(f"种子 {replay.seed} | 星球 {replay.num_planets} | 指令 {len(replay.commands)} | "
+          f"快照 {len(replay.snapshots)} | 结束帧 {replay.end_tick}")
+    if replay.end_tick is None:
+        print(f"录制不完整（没有结束记录{'，末尾的不完整记录已忽略' if replay.truncated else ''}），"
+              f"播放到第 {replay.last_tick} 帧")
+
+    player = ReplayPlayer(replay)
+    start = time.perf_counter()
+    game = player.seek(args.to) if args.to is not None else player.play_to_end()
+    elapsed = time.perf_counter() - start
+
+    neutral_planets, player_planets, enemy_planets = game.planet_counts
+    print(f"第 {game.turn_count} 帧: 玩家星球 {player_planets} | 敌人星球 {enemy_planets} | "
+          f"中立星球 {neutral_planets} | 在途舰队 {len(game.fleets)} | 胜者 {game.winner}")
+    print(f"用时 {elapsed * 1000:.1f}ms")
+    if args.to is None and replay.winner is not None and game.winner != replay.winner:
+        raise ReplayError(f"回放结果与录制不一致：录制胜者 {replay.winner}，回放胜者 {game.winner}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+import heapq
+import math
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+from game_core import NEUTRAL, PLAYER, ENEMY, AI_INTERVAL, PRODUCTION_INTERVAL, fleet_speed, travel_ticks
+
+# 基于蒙特卡洛模拟的AI：对候选走法 (出发星球, 目标星球, 派出比例) 做随机推演，
+# 用 UCB1 分配推演次数，在时间预算内随时可以给出目前最好的走法。
+# 推演使用精简的状态副本（几个列表 + 到达堆），按事件跳帧，不依赖 pygame。
+
+FRACTIONS = (0.25, 0.5, 0.75)
+DEFAULT_BUDGET = 0.2     # 每次决策的时间预算（秒）
+ROLLOUTS_PER_SECOND = 5000  # inline 模式把时间预算换算成固定的推演次数（偏保守的单核推演速度）
+DEFAULT_HORIZON = 600    # 每次推演模拟多少逻辑帧
+PRODUCTION_WEIGHT = 20   # 估值时每点产能折算的飞船数
+EXPLORATION = 1.4
+
+
+@lru_cache(maxsize=4096)
+def fleet_travel_ticks(ships):
+    return travel_ticks(fleet_speed(ships))
+
+
+# 推演用的精简状态
+class SimState:
+    __slots__ = ("owner", "ships", "production", "fleets", "tick", "production_timer", "seq")
+
+    def __init__(self, owner, ships, production, fleets, tick, production_timer, seq=0):
+        self.owner = owner
+        self.ships = ships
+        self.production = production
+        self.fleets = fleets  # 堆：(到达帧, 序号, 目标星球, 飞船数, 归属)
+        self.tick = tick
+        self.production_timer = production_timer
+        self.seq = seq
+
+    @classmethod
+    def from_game(cls, game):
+        fleets = [(arrival_tick, seq, fleet.end_planet.index, wave[2], fleet.owner)
+                  for arrival_tick, seq, fleet, wave in game.arrivals]
+        heapq.heapify(fleets)
+        return cls([p.owner for p in game.planets], [p.ships for p in game.planets],
+                   [p.production_rate for p in game.planets], fleets,
+                   game.turn_count, game.production_timer, game.launch_seq)
+
+    def copy(self):
+        return SimState(self.owner[:], self.ships[:], self.production, self.fleets[:],
+                        self.tick, self.production_timer, self.seq)
+
+    def launch(self, source, target, ships, owner):
+        self.ships[source] -= ships
+        heapq.heappush(self.fleets, (self.tick + fleet_travel_ticks(ships), self.seq, target, ships, owner))
+        self.seq += 1
+
+    def alive(self, owner):
+        return owner in self.owner or any(f[4] == owner for f in self.fleets)
+
+    # 与 Game.ai_turn 相同的随机策略，作为推演中双方的默认走法
+    def random_policy(self, owner, rng):
+        mine = [i for i, o in enumerate(self.owner) if o == owner]
+        if not mine:
+            return
+        if rng.random() < 0.5:
+            source = rng.choice(mine)
+            if self.ships[source] > 1:
+                targets = [i for i, o in enumerate(self.owner) if o != owner]
+                if targets:
+                    self.launch(source, rng.choice(targets), self.ships[source] // 2, owner)
+        elif len(mine) > 1:
+            source = max(mine, key=lambda i: self.ships[i])
+            target = min(mine, key=lambda i: self.ships[i])
+            if source != target and self.ships[source] > 1:
+                self.launch(source, target, self.ships[source] // 2, owner)
+
+    # 推进到 until 帧：只在生产、到达和AI行动这些事件发生的帧上停下来
+    def advance(self, until, rng):
+        owner = self.owner
+        ships = self.ships
+        fleets = self.fleets
+        ticks = 0
+        while self.tick < until:
+            delta = min(until - self.tick,
+                        PRODUCTION_INTERVAL - self.production_timer,
+                        1 + (-self.tick % AI_INTERVAL))
+            if fleets:
+                delta = min(delta, max(1, fleets[0][0] - self.tick))
+            self.tick += delta
+            ticks += delta
+
+            self.production_timer += delta
+            if self.production_timer >= PRODUCTION_INTERVAL:
+                self.production_timer = 0
+                for i, o in enumerate(owner):
+                    if o != NEUTRAL:
+                        ships[i] += self.production[i]
+
+            while fleets and fleets[0][0] <= self.tick:
+                _, _, target, count, fleet_owner = heapq.heappop(fleets)
+                if owner[target] == fleet_owner:
+                    ships[target] += count
+                elif count > ships[target]:
+                    owner[target] = fleet_owner
+                    ships[target] = count - ships[target]
+                else:
+                    ships[target] -= count
+
+            if not self.alive(PLAYER) or not self.alive(ENEMY):
+                break
+
+            if (self.tick - 1) % AI_INTERVAL == 0:
+                self.random_policy(PLAYER, rng)
+                self.random_policy(ENEMY, rng)
+        return ticks
+
+    # 估值：(己方兵力 + 产能) - (对方兵力 + 产能)，归一化到 [-1, 1]
+    def evaluate(self, me):
+        totals = {PLAYER: 0, ENEMY: 0}
+        for i, o in enumerate(self.owner):
+            if o != NEUTRAL:
+                totals[o] += self.ships[i] + self.production[i] * PRODUCTION_WEIGHT
+        for _, _, _, count, o in self.fleets:
+            totals[o] += count
+        them = ENEMY if me == PLAYER else PLAYER
+        total = totals[me] + totals[them]
+        if total == 0:
+            return 0.0
+        return (totals[me] - totals[them]) / total
+
+
+def candidate_moves(state, owner, fractions=FRACTIONS):
+    moves = [None]  # None 表示这一回合不出兵
+    for source, o in enumerate(state.owner):
+        if o != owner or state.ships[source] <= 1:
+            continue
+        for target in range(len(state.owner)):
+            if target == source:
+                continue
+            for fraction in fractions:
+                moves.append((source, target, fraction))
+    return moves
+
+
+def apply_move(state, move, owner):
+    if move is None:
+        return
+    source, target, fraction = move
+    ships = int(state.ships[source] * fraction)
+    if ships > 0:
+        state.launch(source, target, ships, owner)
+
+
+# 随时可中断的搜索：不断推演直到用完时间预算 budget（秒，None 表示不限时）或推演次数 max_rollouts，
+# 返回访问次数最多的走法和统计；stop 是可选的 threading.Event
+# 只按 max_rollouts 停止时，结果只取决于 state 和 seed
+def search(state, owner, budget=DEFAULT_BUDGET, seed=None, horizon=DEFAULT_HORIZON,
+           fractions=FRACTIONS, stop=None, max_rollouts=None):
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    deadline = None if budget is None else start + budget
+    moves = candidate_moves(state, owner, fractions)
+    visits = [0] * len(moves)
+    values = [0.0] * len(moves)
+    rollouts = 0
+    simulated = 0
+
+    while True:
+        # 先把每个候选都试一次，之后按 UCB1 选择
+        if rollouts < len(moves):
+            i = rollouts
+        else:
+            log_total = math.log(rollouts)
+            i = max(range(len(moves)),
+                    key=lambda k: values[k] / visits[k] + EXPLORATION * math.sqrt(log_total / visits[k]))
+
+        sim = state.copy()
+        apply_move(sim, moves[i], owner)
+        simulated += sim.advance(state.tick + horizon, rng)
+        visits[i] += 1
+        values[i] += sim.evaluate(owner)
+        rollouts += 1
+
+        if max_rollouts is not None and rollouts >= max_rollouts:
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if stop is not None and stop.is_set():
+            break
+
+    best = moves[max(range(len(moves)), key=lambda k: (visits[k], values[k]))]
+    elapsed = time.perf_counter() - start
+    stats = {
+        "candidates": len(moves),
+        "rollouts": rollouts,
+        "simulated_ticks": simulated,
+        "elapsed": elapsed,
+    }
+    return best, stats
+
+
+# 挂到 game.ai_controllers[owner] 上使用
+# mode: "inline" 在 AI 回合里同步搜索，按固定推演次数 max_rollouts（默认由 budget 换算）停止，
+#       与机器快慢无关，同一种子的对局可复现（无窗口批量对战）；
+#       "thread" / "process" 在后台按时间预算搜索，游戏循环不会被阻塞，结果在下一个 AI 回合使用
+class SearchAI:
+    def __init__(self, budget=DEFAULT_BUDGET, mode="process", horizon=DEFAULT_HORIZON, fractions=FRACTIONS,
+                 max_rollouts=None):
+        if mode not in ("inline", "thread", "process"):
+            raise ValueError(f"未知的搜索模式: {mode}")
+        self.budget = budget
+        self.mode = mode
+        self.horizon = horizon
+        self.fractions = fractions
+        if max_rollouts is None:
+            max_rollouts = max(1, round(budget * ROLLOUTS_PER_SECOND))
+        self.max_rollouts = max_rollouts
+        self.executor = None
+        self.future = None
+        self.stop = None
+        self.search_game = None  # 后台搜索是为哪一局发起的
+        self.decisions = 0
+        self.rollouts = 0
+        self.simulated_ticks = 0
+        self.search_time = 0.0
+
+    @property
+    def ticks_per_sec(self):
+        return self.simulated_ticks / self.search_time if self.search_time > 0 else 0.0
+
+    def act(self, game, owner):
+        if self.mode == "inline":
+            move, stats = search(SimState.from_game(game), owner, None, game.rng.getrandbits(32),
+                                 self.horizon, self.fractions, max_rollouts=self.max_rollouts)
+            self.apply(game, owner, move, stats)
+            return
+
+        if self.executor is None:
+            pool = ThreadPoolExecutor if self.mode == "thread" else ProcessPoolExecutor
+            self.executor = pool(max_workers=1)
+
+        # 上一局（重新开始之前）留下的搜索：星球下标属于旧地图，直接丢弃
+        if self.future is not None and self.search_game is not game:
+            self.reset()
+
+        if self.future is not None:
+            if self.future.done():
+                move, stats = self.future.result()
+                self.apply(game, owner, move, stats)
+                self.future = None
+            elif self.mode == "thread":
+                # 预算还没用完就又轮到行动：让搜索提前结束，先用目前最好的走法
+                self.stop.set()
+                move, stats = self.future.result()
+                self.apply(game, owner, move, stats)
+                self.future = None
+            else:
+                return
+
+        state = SimState.from_game(game)
+        seed = game.rng.getrandbits(32)
+        self.search_game = game
+        if self.mode == "thread":
+            self.stop = threading.Event()
+            self.future = self.executor.submit(search, state, owner, self.budget, seed, self.horizon,
+                                               self.fractions, self.stop)
+        else:
+            self.future = self.executor.submit(search, state, owner, self.budget, seed, self.horizon,
+                                               self.fractions)
+
+    # 放弃正在进行的搜索（例如换了一局），结果不会再被使用
+    def reset(self):
+        if self.stop is not None:
+            self.stop.set()
+        if self.future is not None:
+            self.future.cancel()
+        self.future = None
+        self.stop = None
+        self.search_game = None
+
+    # 走法是在旧状态上选的：出发星球可能已经易主，按当前兵力重新计算派出数量
+    def apply(self, game, owner, move, stats):
+        self.decisions += 1
+        self.rollouts += stats["rollouts"]
+        self.simulated_ticks += stats["simulated_ticks"]
+        self.search_time += stats["elapsed"]
+        if move is None:
+            return
+        source, target, fraction = move
+        source_planet = game.planets[source]
+        if source_planet.owner != owner:
+            return
+        ships = int(source_planet.ships * fraction)
+        if ships > 0:
+            game.launch_fleet(source_planet, game.planets[target], ships, owner)
+
+    def stats(self):
+        return {
+            "decisions": self.decisions,
+            "rollouts": self.rollouts,
+            "simulated_ticks": self.simulated_ticks,
+            "search_time": self.search_time,
+            "ticks_per_sec": self.ticks_per_sec,
+        }
+
+    def close(self):
+        self.reset()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
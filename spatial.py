@@ -0,0 +1,98 @@
+import math
+
+# 空间索引：点击检测只看附近几个格子；地图生成用泊松圆盘采样
+
+
+class SpatialGrid:
+    def __init__(self, width, height, cell_size):
+        self.cell_size = cell_size
+        self.cols = max(1, int(math.ceil(width / cell_size)))
+        self.rows = max(1, int(math.ceil(height / cell_size)))
+        self.cells = {}
+        self.count = 0
+
+    def cell_of(self, x, y):
+        col = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        row = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return col, row
+
+    def insert(self, item, x, y):
+        self.cells.setdefault(self.cell_of(x, y), []).append((x, y, item))
+        self.count += 1
+
+    # 返回 (x, y) 周围 radius 范围内格子中的所有条目（未做精确距离过滤）
+    def nearby(self, x, y, radius):
+        col0, row0 = self.cell_of(x - radius, y - radius)
+        col1, row1 = self.cell_of(x + radius, y + radius)
+        cells = self.cells
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                bucket = cells.get((col, row))
+                if bucket:
+                    yield from bucket
+
+
+# 在 [margin, width-margin] x [margin, height-margin] 内生成最多 count 个点，任意两点距离不小于 min_distance
+# 先随机投点（分布与原来的拒绝采样一致），投点连续失败 attempts 次后改用 Bridson 泊松圆盘采样
+# 从已有点向外填补空隙；活动列表耗尽即停止，因此一定会结束，空间不够时返回的点少于 count
+def poisson_disk_sample(rng, width, height, min_distance, count, margin=50, attempts=30):
+    x0, y0 = margin, margin
+    x1, y1 = width - margin, height - margin
+    if count <= 0 or x1 < x0 or y1 < y0:
+        return []
+
+    # 格子边长 r/√2，每个格子最多一个点，检测只需看周围 5x5 个格子
+    cell = min_distance / math.sqrt(2)
+    cols = int(width / cell) + 1
+    rows = int(height / cell) + 1
+    grid = [-1] * (cols * rows)
+    r2 = min_distance * min_distance
+    points = []
+
+    def fits(x, y):
+        col = int(x / cell)
+        row = int(y / cell)
+        for r in range(max(row - 2, 0), min(row + 3, rows)):
+            base = r * cols
+            for c in range(max(col - 2, 0), min(col + 3, cols)):
+                j = grid[base + c]
+                if j >= 0:
+                    px, py = points[j]
+                    if (px - x) ** 2 + (py - y) ** 2 < r2:
+                        return False
+        return True
+
+    def add(x, y):
+        grid[int(y / cell) * cols + int(x / cell)] = len(points)
+        points.append((x, y))
+
+    # 阶段一：随机投点
+    while len(points) < count:
+        for _ in range(attempts):
+            x = rng.randint(x0, x1)
+            y = rng.randint(y0, y1)
+            if fits(x, y):
+                add(x, y)
+                break
+        else:
+            break
+
+    # 阶段二：Bridson，在已有点周围 [r, 2r] 的环内找候选点
+    active = list(range(len(points)))
+    while active and len(points) < count:
+        i = rng.randrange(len(active))
+        px, py = points[active[i]]
+        for _ in range(attempts):
+            angle = rng.uniform(0, 2 * math.pi)
+            distance = rng.uniform(min_distance, 2 * min_distance)
+            x = int(round(px + math.cos(angle) * distance))
+            y = int(round(py + math.sin(angle) * distance))
+            if x0 <= x <= x1 and y0 <= y <= y1 and fits(x, y):
+                add(x, y)
+                active.append(len(points) - 1)
+                break
+        else:
+            active[i] = active[-1]
+            active.pop()
+
+    return points
@@ -0,0 +1,88 @@
+import json
+import os
+
+import pygame
+
+# 启动缓存：把系统字体扫描的结果和缩放好的背景图存到磁盘，之后的启动直接读取
+# 缓存目录：$XDG_CACHE_HOME/summer_for_free（默认 ~/.cache/summer_for_free）
+# 缓存写不进去（只读文件系统等）时照常运行，只是每次都走慢路径
+
+FONT_CACHE = "fonts.json"
+BACKGROUND_META = "background.json"
+
+
+def cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "summer_for_free")
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path, data):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f)
+    except OSError:
+        pass
+
+
+# 按名字查找字体文件并缓存路径，避免每次启动都扫描系统字体目录
+# 找不到时缓存空字符串，使用 pygame 默认字体（与 SysFont 的回退行为一致）
+def resolve_font(name):
+    path = os.path.join(cache_dir(), FONT_CACHE)
+    fonts = _read_json(path)
+    cached = fonts.get(name)
+    if cached is not None and (cached == "" or os.path.exists(cached)):
+        return cached or None
+
+    resolved = pygame.font.match_font(name)
+    fonts[name] = resolved or ""
+    _write_json(path, fonts)
+    return resolved
+
+
+def load_font(name, size):
+    return pygame.font.Font(resolve_font(name), size)
+
+
+# 加载并缩放背景图；缩放结果以 BMP 缓存，源文件修改时间或屏幕尺寸变化时重建
+# 返回已 convert() 的 Surface，图片不存在时返回 None
+def load_background(image_path, size):
+    try:
+        mtime = os.stat(image_path).st_mtime_ns
+    except OSError:
+        return None
+
+    directory = cache_dir()
+    meta_path = os.path.join(directory, BACKGROUND_META)
+    cached_path = os.path.join(directory, f"background_{size[0]}x{size[1]}.bmp")
+    key = {"source": os.path.abspath(image_path), "mtime": mtime, "size": list(size)}
+
+    if _read_json(meta_path).get(cached_path) == key and os.path.exists(cached_path):
+        try:
+            return pygame.image.load(cached_path).convert()
+        except pygame.error:
+            pass
+
+    try:
+        image = pygame.image.load(image_path).convert()
+    except pygame.error:
+        return None
+    image = pygame.transform.scale(image, size)
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        pygame.image.save(image, cached_path)
+        meta = _read_json(meta_path)
+        meta[cached_path] = key
+        _write_json(meta_path, meta)
+    except (OSError, pygame.error):
+        pass
+    return image
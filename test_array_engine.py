@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from array_engine import ArrayState
+from game_core import Game, PLAYER, ENEMY
+
+# 数组引擎与对象模型（Game.resolve_arrivals）逐帧对照
+
+
+def random_launches(game, rng, count):
+    for _ in range(count):
+        source = rng.choice(game.planets)
+        target = rng.choice(game.planets)
+        if source is not target and source.owner != 0 and source.ships > 1:
+            game.launch_fleet(source, target, rng.randint(1, source.ships // 2 + 1), source.owner)
+
+
+def assert_same(game, state):
+    assert [p.owner for p in game.planets] == state.planet_owner.tolist()
+    assert [p.ships for p in game.planets] == state.planet_ships.tolist()
+    assert len(game.arrivals) == state.fleet_count
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_game_resolve_arrivals(seed):
+    game = Game(seed=seed, ai_players=(), num_planets=30, width=1000, height=1000)
+    rng = random.Random(seed)
+    for planet in game.planets:
+        planet.owner = rng.choice((0, PLAYER, ENEMY))
+        planet.ships = rng.randint(0, 200)
+    game.recount()
+
+    # 先在对象模型里放出一批在途舰队，再转换成数组状态
+    for _ in range(50):
+        random_launches(game, rng, 5)
+        game.turn_count += 1
+        game.resolve_arrivals()
+    state = ArrayState.from_game(game)
+    assert_same(game, state)
+
+    # 之后双方执行相同的发射，逐帧比较
+    for _ in range(400):
+        before = len(game.arrivals)
+        random_launches(game, rng, 3)
+        for _, _, fleet, wave in sorted(game.arrivals, key=lambda entry: entry[1])[before:]:
+            state.launch(fleet.start_planet.index, fleet.end_planet.index, wave[2], fleet.owner)
+        game.turn_count += 1
+        game.resolve_arrivals()
+        state.update()
+        assert_same(game, state)
+
+
+def test_launch_many_matches_launch():
+    game = Game(seed=1, ai_players=(), num_planets=10)
+    one = ArrayState.from_game(game)
+    many = ArrayState.from_game(game)
+    sources, targets, ships, owners = [0, 0, 1], [2, 3, 4], [3, 5, 7], [PLAYER, PLAYER, ENEMY]
+    for launch in zip(sources, targets, ships, owners):
+        one.launch(*launch)
+    many.launch_many(sources, targets, ships, owners)
+    for _ in range(200):
+        one.update()
+        many.update()
+    assert one.planet_ships.tolist() == many.planet_ships.tolist()
+    assert one.planet_owner.tolist() == many.planet_owner.tolist()
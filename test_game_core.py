@@ -0,0 +1,47 @@
+import pytest
+
+from game_core import Game, PLAYER, ENEMY
+
+# 航线合并只改变舰队的组织方式：每一波保留自己的速度和到达帧，对局结果与不合并时完全相同
+
+
+def play(seed, merge_window):
+    game = Game(seed=seed, ai_players=(PLAYER, ENEMY), merge_window=merge_window)
+    merged = 0
+    while not game.game_over and game.turn_count < 36000:
+        game.tick()
+        merged = max(merged, max((len(fleet.waves) for fleet in game.fleets), default=0))
+    return game, merged
+
+
+def outcome(game):
+    return game.winner, game.turn_count, [(p.owner, p.ships) for p in game.planets], game.launch_seq
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_merging_does_not_change_the_match(seed):
+    merged_game, _ = play(seed, 60)
+    separate_game, waves = play(seed, -1)  # -1：从不合并
+    assert waves <= 1
+    assert outcome(merged_game) == outcome(separate_game)
+
+
+def test_ai_launches_merge():
+    assert any(play(seed, 60)[1] > 1 for seed in range(20))
+
+
+def test_fleet_speed_matches_each_wave():
+    game = Game(seed=3, ai_players=())
+    source, target = game.planets[0], game.planets[2]
+    source.ships = 1000
+    first = game.launch_fleet(source, target, 10, source.owner)
+    for _ in range(30):
+        game.tick()
+    second = game.launch_fleet(source, target, 200, source.owner)
+    assert second is first and len(first.waves) == 2
+    (launch_a, arrival_a, ships_a, _), (launch_b, arrival_b, ships_b, _) = first.waves
+    assert (ships_a, ships_b) == (10, 200)
+    # 后发的一波从出发星球起飞，不会提前到达
+    assert launch_b == launch_a + 30
+    assert first.wave_progress(first.waves[1], game.turn_count) == 0
+    assert arrival_b > arrival_a
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from game_core import Game, PLAYER, ENEMY
+from replay import Replay, ReplayPlayer, ReplayRecorder
+
+# 录制的对局与回放（播放到结束、跳转到任意帧）逐项对照
+
+
+def state(game):
+    planets = [(p.owner, p.ships) for p in game.planets]
+    fleets = sorted((f.start_planet.index, f.end_planet.index, f.owner, tuple(f.waves)) for f in game.fleets)
+    return game.turn_count, game.winner, planets, fleets
+
+
+def record(path, seed, marks=()):
+    game = Game(seed=seed, ai_players=(PLAYER, ENEMY))
+    recorder = ReplayRecorder(path, game)
+    seen = {}
+    while not game.game_over and game.turn_count < 36000:
+        game.tick()
+        if game.turn_count in marks:
+            seen[game.turn_count] = state(game)
+    recorder.close()
+    return game, seen
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_play_to_end_matches_recorded_game(tmp_path, seed):
+    path = tmp_path / "game.rpl"
+    game, _ = record(path, seed)
+    replay = Replay.load(path)
+    assert replay.winner == game.winner
+    assert state(ReplayPlayer(replay).play_to_end()) == state(game)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_seek_matches_recorded_game(tmp_path, seed):
+    path = tmp_path / "game.rpl"
+    rng = random.Random(seed)
+    marks = set(rng.sample(range(1, 3000), 15))
+    _, seen = record(path, seed, marks)
+
+    # 随机顺序跳转：向前、向后、跨快照
+    player = ReplayPlayer(Replay.load(path))
+    ticks = list(seen)
+    rng.shuffle(ticks)
+    for tick in ticks:
+        assert state(player.seek(tick)) == seen[tick]
+
+
+def test_truncated_recording_plays_to_last_record(tmp_path):
+    path = tmp_path / "game.rpl"
+    record(path, 28)
+    data = path.read_bytes()
+    for cut in (1, 7, 100):
+        path.write_bytes(data[:-cut])
+        replay = Replay.load(path)
+        assert replay.end_tick is None
+        game = ReplayPlayer(replay).play_to_end()
+        assert game.turn_count >= replay.last_tick
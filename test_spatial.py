@@ -0,0 +1,31 @@
+import itertools
+import random
+
+from spatial import SpatialGrid, poisson_disk_sample
+
+# 地图生成和点击检测用的空间索引
+
+
+def test_overfull_map_stops_with_fewer_points():
+    width, height, min_distance, margin = 600, 400, 100, 50
+    points = poisson_disk_sample(random.Random(0), width, height, min_distance, 1000, margin=margin)
+
+    assert 0 < len(points) < 1000
+    for x, y in points:
+        assert margin <= x <= width - margin
+        assert margin <= y <= height - margin
+    for (x0, y0), (x1, y1) in itertools.combinations(points, 2):
+        assert (x0 - x1) ** 2 + (y0 - y1) ** 2 >= min_distance ** 2
+
+
+def test_same_seed_same_points():
+    first = poisson_disk_sample(random.Random(7), 1000, 700, 100, 30)
+    second = poisson_disk_sample(random.Random(7), 1000, 700, 100, 30)
+    assert first == second
+
+
+def test_nearby_finds_items_in_neighbouring_cells():
+    grid = SpatialGrid(1000, 700, 80)
+    grid.insert("a", 79, 79)
+    grid.insert("b", 500, 500)
+    assert [item for _, _, item in grid.nearby(85, 85, 40)] == ["a"]
@@ -0,0 +1,43 @@
+import time
+
+# 固定步长的模拟时钟：逻辑帧率与渲染帧率互不影响
+# 每个渲染帧调用 advance()，返回本帧需要推进的逻辑帧数；alpha 是两个逻辑帧之间的插值比例
+
+SIM_RATE = 60          # 每秒逻辑帧数（1倍速）
+MAX_FRAME_TIME = 0.25  # 单个渲染帧最多补算的真实时间，避免卡顿后越追越慢
+SPEEDS = (1, 2, 4, 8, 16)
+
+
+class FixedTimestep:
+    def __init__(self, sim_rate=SIM_RATE, speed=1, clock=time.perf_counter):
+        self.step = 1.0 / sim_rate
+        self.speed = speed
+        self.clock = clock
+        self.accumulator = 0.0
+        self.last = None
+        self.alpha = 0.0
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.last = None
+        self.alpha = 0.0
+
+    def advance(self):
+        now = self.clock()
+        if self.last is None:
+            self.last = now
+        frame_time = min(now - self.last, MAX_FRAME_TIME)
+        self.last = now
+
+        self.accumulator += frame_time * self.speed
+        steps = int(self.accumulator / self.step)
+        self.accumulator -= steps * self.step
+        self.alpha = self.accumulator / self.step
+        return steps
+
+    # 快进档位：在 SPEEDS 中切换
+    def faster(self):
+        self.speed = next((s for s in SPEEDS if s > self.speed), self.speed)
+
+    def slower(self):
+        self.speed = next((s for s in reversed(SPEEDS) if s < self.speed), self.speed)